@@ -0,0 +1,25 @@
+"""
+Precompute the LALR parsing table for the AILang grammar.
+
+Writes compiler/grammar_table.pkl, which compiler.lexer loads instead of
+building the parser from grammar.lark. Run as part of the package build
+(see [tool.poetry.build] in pyproject.toml) or manually with
+``python build_grammar.py``.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from compiler.lexer import save_grammar_table
+
+
+def build(setup_kwargs=None):
+    """Poetry build hook: regenerate the grammar table before packaging."""
+    path = save_grammar_table()
+    print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    build()
@@ -0,0 +1 @@
+"""AILang command line interface."""
@@ -6,9 +6,15 @@ This module provides a command-line interface for the AILang compiler.
 
 import os
 import sys
+import subprocess
 import argparse
+import importlib
 import importlib.util
 import json
+import datetime
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, List, Dict, Any, Union
 
@@ -17,28 +23,90 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # Import the compiler components
 try:
+    from compiler import ir as compiler_ir
+    from compiler import parser as compiler_parser
+    from compiler.lexer import GRAMMAR_PATH
     from compiler.parser import parse
-    from compiler.transpiler.py_transpiler import transpile_to_python
-    from compiler.transpiler.cpp_transpiler import transpile_to_cpp
-    from compiler.transpiler.js_transpiler import transpile_to_js
-    from compiler.file_utils import get_build_manager, BuildManager
+    from compiler.file_utils import get_build_manager, BuildManager, IO_BUFFER_SIZE
 except ImportError as e:
     print(f"Error importing compiler modules: {e}")
     print("Make sure you're running from the project root directory.")
     sys.exit(1)
 
-# Supported targets and their file extensions
+# Supported targets and their file extensions. Transpilers are given as
+# 'module:function' specs and only imported when a target is first used.
 TARGETS = {
-    'python': {'ext': 'py', 'transpiler': transpile_to_python, 'runner': 'python'},
-    'cpp': {'ext': 'cpp', 'transpiler': transpile_to_cpp, 'runner': 'g++'},
-    'javascript': {'ext': 'js', 'transpiler': transpile_to_js, 'runner': 'node'},
+    'python': {
+        'ext': 'py',
+        'transpiler': 'compiler.transpiler.py_transpiler:transpile_to_python',
+        'runner': 'python',
+    },
+    'cpp': {
+        'ext': 'cpp',
+        'transpiler': 'compiler.transpiler.cpp_transpiler:transpile_to_cpp',
+        'stream': 'compiler.transpiler.cpp_transpiler:iter_transpile_to_cpp',
+        'runner': 'g++',
+    },
+    'javascript': {
+        'ext': 'js',
+        'transpiler': 'compiler.transpiler.js_transpiler:transpile_to_js',
+        'runner': 'node',
+    },
 }
 
+# Flags passed to g++ when building C++ targets; part of the binary cache key
+CPP_COMPILE_FLAGS = [
+    '-std=c++17',
+    '-O2',
+    '-I/usr/local/include/eigen3',  # Adjust Eigen path as needed
+]
+
+# IR module source; its rewrite passes shape the generated code
+IR_PATH = Path(compiler_ir.__file__)
+
+# Parser module source; its transformer builds the IR the transpilers read
+PARSER_PATH = Path(compiler_parser.__file__)
+
 # Initialize build manager
 build_manager = get_build_manager()
 
+@lru_cache(maxsize=None)
+def _load(spec: str) -> Any:
+    """Import and return the callable named by a 'module:function' spec."""
+    module_name, func_name = spec.split(':')
+    return getattr(importlib.import_module(module_name), func_name)
+
+@lru_cache(maxsize=None)
+def _transpiler_version(target: str, optimize: bool = False) -> str:
+    """
+    Identify the code generator for a target.
+    
+    The version is a hash of the transpiler module source, the IR module (whose
+    rewrite passes run during optimized code generation), the parser module
+    (whose transformer builds the IR) and the grammar, so cached compile
+    results are invalidated whenever any of them changes, and optimized output
+    is cached apart from plain output. The transpiler module is located
+    without importing it, so cache hits stay cheap.
+    """
+    module_name = TARGETS[target]['transpiler'].split(':')[0]
+    digest = hashlib.sha256(Path(importlib.util.find_spec(module_name).origin).read_bytes())
+    digest.update(IR_PATH.read_bytes())
+    digest.update(PARSER_PATH.read_bytes())
+    digest.update(GRAMMAR_PATH.read_bytes())
+    if optimize:
+        digest.update(b'optimize')
+    return digest.hexdigest()
+
+def _track_output_size(fragments, metadata: Dict[str, Any]):
+    """Pass fragments through unchanged, recording their total size in metadata once exhausted."""
+    size = 0
+    for fragment in fragments:
+        size += len(fragment)
+        yield fragment
+    metadata['output_size'] = size
+
 def compile_file(input_path: str, target: str, output_path: Optional[str] = None, 
-                clean: bool = False) -> Dict[str, Any]:
+                clean: bool = False, optimize: bool = False) -> Dict[str, Any]:
     """
     Compile an AILang source file to the specified target language.
     
@@ -47,6 +115,7 @@ def compile_file(input_path: str, target: str, output_path: Optional[str] = None
         target: Target language (python, cpp, javascript)
         output_path: Optional output path for the compiled file
         clean: Whether to clean previous builds for this target
+        optimize: Whether to apply the IR rewrite passes, which may drop layers
         
     Returns:
         Dict containing compilation metadata and output paths
@@ -59,51 +128,77 @@ def compile_file(input_path: str, target: str, output_path: Optional[str] = None
         build_manager.clean(target=target)
     
     # Read input file
-    input_path = Path(input_path).resolve()
-    with open(input_path, 'r', encoding='utf-8') as f:
+    input_path = build_manager.absolute_path(input_path)
+    with open(input_path, 'r', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
         source = f.read()
     
-    # Parse the source code
-    try:
-        ir = parse(source)
-    except Exception as e:
-        print(f"Error parsing {input_path}: {e}")
-        if hasattr(e, 'line') and hasattr(e, 'column'):
-            print(f"  at line {e.line}, column {e.column}")
-        sys.exit(1)
-    
-    # Transpile to target language
-    try:
-        transpiler = TARGETS[target]['transpiler']
-        output = transpiler(ir)
-    except Exception as e:
-        print(f"Error transpiling to {target}: {e}")
-        if hasattr(e, '__traceback__'):
-            import traceback
-            traceback.print_exc()
-        sys.exit(1)
+    # Reuse the output of a previous compile of the same source and target
+    source_bytes = source.encode('utf-8')
+    version = _transpiler_version(target, optimize)
+    cached_output = build_manager.get_cached_output(source_bytes, target, version)
     
     # Prepare metadata
     metadata = {
         'target': target,
         'source_file': str(input_path),
         'source_size': len(source),
-        'output_size': len(output),
+        'output_size': 0,
         'timestamp': str(datetime.datetime.now())
     }
     
-    # Write output file using build manager
-    if output_path:
-        output_path = Path(output_path).resolve()
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(output)
-        metadata['output_path'] = str(output_path)
-    else:
-        output_path = build_manager.write_compiled_file(
-            input_path, target, output, metadata=metadata
-        )
+    stream = None
+    if cached_output is None:
+        # Parse the source code, reusing a cached IR for unchanged sources
+        ir = build_manager.get_cached_parse(source_bytes, GRAMMAR_PATH)
+        try:
+            if ir is None:
+                ir = parse(source)
+                build_manager.store_cached_parse(source_bytes, GRAMMAR_PATH, ir)
+        except Exception as e:
+            print(f"Error parsing {input_path}: {e}")
+            if hasattr(e, 'line') and hasattr(e, 'column'):
+                print(f"  at line {e.line}, column {e.column}")
+            sys.exit(1)
+        stream = TARGETS[target].get('stream')
+        if stream:
+            stream = _load(stream)
+    
+    # Transpile to target language and write the output. Targets with a
+    # streaming transpiler are written fragment by fragment, so transpile
+    # errors may surface while writing.
+    try:
+        if cached_output is not None:
+            output = cached_output
+            metadata['output_size'] = len(output)
+        elif stream:
+            output = _track_output_size(stream(ir, optimize=optimize), metadata)
+        else:
+            output = _load(TARGETS[target]['transpiler'])(ir, optimize=optimize)
+            metadata['output_size'] = len(output)
+        
+        # Write output file using build manager
+        if output_path:
+            output_path = build_manager.absolute_path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(output_path, 'w', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
+                if stream:
+                    f.writelines(output)
+                else:
+                    f.write(output)
+        else:
+            output_path = build_manager.write_compiled_file(
+                input_path, target, output, metadata=metadata
+            )
         metadata['output_path'] = str(output_path)
+    except Exception as e:
+        print(f"Error transpiling to {target}: {e}")
+        if hasattr(e, '__traceback__'):
+            import traceback
+            traceback.print_exc()
+        sys.exit(1)
+    
+    if cached_output is None:
+        build_manager.store_cached_output(source_bytes, target, version, output_path)
     
     # Save build info
     build_info = {
@@ -117,6 +212,61 @@ def compile_file(input_path: str, target: str, output_path: Optional[str] = None
     
     return build_info
 
+def _compile_task(task: tuple) -> Dict[str, Any]:
+    """Compile a single (input_path, target, optimize) task; runs in a worker process."""
+    input_path, target, optimize = task
+    return compile_file(input_path, target, optimize=optimize)
+
+def compile_files(input_paths: List[str], targets: List[str], clean: bool = False,
+                  optimize: bool = False) -> List[Dict[str, Any]]:
+    """
+    Compile every input file to every target, in parallel across processes.
+    
+    Each (input, target) pair is independent, so they are fanned out over a
+    process pool; the on-disk parse cache is shared between the workers.
+    
+    Args:
+        input_paths: Paths to the input .ail files
+        targets: Target languages (python, cpp, javascript)
+        clean: Whether to clean previous builds for these targets
+        optimize: Whether to apply the IR rewrite passes, which may drop layers
+        
+    Returns:
+        List of build info dictionaries, one per (input, target) pair
+    """
+    for target in targets:
+        if target not in TARGETS:
+            raise ValueError(f"Unsupported target: {target}. Available targets: {', '.join(TARGETS.keys())}")
+        if clean:
+            build_manager.clean(target=target)
+    
+    tasks = [(input_path, target, optimize) for input_path in input_paths for target in targets]
+    if len(tasks) <= 1:
+        return [_compile_task(task) for task in tasks]
+    
+    with ProcessPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1)) as executor:
+        results = list(executor.map(_compile_task, tasks))
+    
+    # Workers record artifacts in their own build manager, which is discarded
+    # when they exit, so record them here as well
+    for build_info in results:
+        metadata = build_info['metadata']
+        build_manager.record_artifact(
+            metadata['source_file'], metadata['target'], metadata['output_path'], metadata=metadata
+        )
+    
+    return results
+
+def _parse_targets(value: str) -> List[str]:
+    """Parse a comma-separated list of target languages."""
+    targets = [target.strip() for target in value.split(',') if target.strip()]
+    for target in targets:
+        if target not in TARGETS:
+            raise argparse.ArgumentTypeError(
+                f"invalid target: {target!r} (choose from {', '.join(sorted(TARGETS))})"
+            )
+    return targets
+
 def run_compiled_file(file_path: str, target: str, args: Optional[List[str]] = None) -> None:
     """
     Execute a compiled file based on its target language.
@@ -143,29 +293,23 @@ def run_compiled_file(file_path: str, target: str, args: Optional[List[str]] = N
         elif target == 'javascript':
             cmd = ['node', str(file_path)]
         elif target == 'cpp':
-            # For C++, we need to compile first
-            import subprocess
-            import tempfile
+            # For C++, we need to compile first. Binaries are cached by a hash
+            # of the source and the compiler flags, so unchanged sources skip g++.
+            source_bytes = file_path.read_bytes()
+            binary_path = build_manager.get_cached_binary_path(source_bytes, CPP_COMPILE_FLAGS)
             
-            # Create a temporary directory for the build
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_dir = Path(temp_dir)
-                output_path = temp_dir / 'a.out'
-                
-                # Compile the C++ code
-                compile_cmd = [
-                    'g++',
-                    '-std=c++17',
-                    '-I/usr/local/include/eigen3',  # Adjust Eigen path as needed
-                    str(file_path),
-                    '-o', str(output_path)
-                ]
+            if not binary_path.exists():
+                # Compile to a temporary name so a failed build never leaves a cached binary
+                temp_path = binary_path.with_name(f"{binary_path.name}.tmp")
+                # '-x c++' since build outputs keep the source file's extension
+                compile_cmd = ['g++', *CPP_COMPILE_FLAGS, '-x', 'c++', str(file_path), '-o', str(temp_path)]
                 
                 print(f"Compiling C++ code: {' '.join(compile_cmd)}")
                 subprocess.run(compile_cmd, check=True)
-                
-                # Run the compiled binary
-                cmd = [str(output_path)]
+                os.replace(temp_path, binary_path)
+            
+            # Run the compiled binary
+            cmd = [str(binary_path)]
         
         if args:
             cmd.extend(args)
@@ -202,14 +346,19 @@ def parse_args() -> argparse.Namespace:
     )
     compile_parser.add_argument('input', help='Input .ail file')
     compile_parser.add_argument('--target', '-t', 
-                              choices=sorted(TARGETS.keys()), 
+                              type=_parse_targets, 
                               default='python',
-                              help='Target language')
+                              help='Target language, or a comma-separated list of targets '
+                                   f'({", ".join(sorted(TARGETS))})')
     compile_parser.add_argument('--output', '-o', 
                               help='Output file path (default: build/obj/<target>/<input>.<ext>)')
     compile_parser.add_argument('--clean', '-c', 
                               action='store_true',
                               help='Clean previous build artifacts for this target')
+    compile_parser.add_argument('--optimize', '-O',
+                              action='store_true',
+                              help='Apply IR rewrite passes, such as dropping linear Dense layers '
+                                   'that an adjacent layer can absorb; changes the parameter count')
     compile_parser.add_argument('--list-targets', 
                               action='store_true',
                               help='List available target languages and exit')
@@ -223,12 +372,16 @@ def parse_args() -> argparse.Namespace:
     )
     run_parser.add_argument('input', help='Input .ail file')
     run_parser.add_argument('--target', '-t', 
-                          choices=['python', 'javascript'], 
+                          choices=['cpp', 'python', 'javascript'], 
                           default='python',
                           help='Target language')
     run_parser.add_argument('--clean', '-c', 
                           action='store_true',
                           help='Clean previous build artifacts for this target')
+    run_parser.add_argument('--optimize', '-O',
+                          action='store_true',
+                          help='Apply IR rewrite passes, such as dropping linear Dense layers '
+                               'that an adjacent layer can absorb; changes the parameter count')
     run_parser.add_argument('args', nargs=argparse.REMAINDER,
                           help='Arguments to pass to the program')
     
@@ -327,7 +480,14 @@ def main() -> None:
                 print(f"Error: File not found: {args.input}")
                 sys.exit(1)
                 
-            compile_file(args.input, args.target, args.output, clean=args.clean)
+            if args.output:
+                if len(args.target) != 1:
+                    print("Error: --output can only be used with a single target")
+                    sys.exit(1)
+                compile_file(args.input, args.target[0], args.output, clean=args.clean,
+                             optimize=args.optimize)
+            else:
+                compile_files([args.input], args.target, clean=args.clean, optimize=args.optimize)
         
         elif args.command == 'run':
             if not os.path.exists(args.input):
@@ -337,7 +497,8 @@ def main() -> None:
             build_info = compile_file(
                 args.input, 
                 args.target, 
-                clean=args.clean
+                clean=args.clean,
+                optimize=args.optimize
             )
             output_path = build_info['metadata']['output_path']
             run_compiled_file(output_path, args.target, args.args)
@@ -398,6 +559,8 @@ def main() -> None:
             print(f"Error: {e}")
             print("Use -v for more details")
         sys.exit(1)
+    finally:
+        build_manager.flush()
 
 if __name__ == "__main__":
     try:
@@ -4,11 +4,53 @@ Handles build directory management, file operations, and path resolution.
 """
 
 import os
+import time
+import atexit
 import shutil
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterable, List, Union
 import json
 import hashlib
+import pickle
+from functools import lru_cache
+
+# Use orjson for build metadata when available; it is several times faster than json
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+    
+    _loads = json.loads
+
+# Buffer size for source, output and metadata files; large enough that
+# typical files are read or written with a single syscall
+IO_BUFFER_SIZE = 1024 * 1024
+
+@lru_cache(maxsize=1024)
+def _path_hash(path: str) -> str:
+    """Return a short, stable hash of a source path used to disambiguate output names."""
+    return hashlib.blake2b(path.encode(), digest_size=4).hexdigest()
+
+# Modules that define the parsed IR: the transformer that builds it and the classes it is made of
+_IR_MODULE_PATHS = tuple(Path(__file__).with_name(name) for name in ('parser.py', 'ir.py'))
+
+@lru_cache(maxsize=None)
+def _ir_code_digest() -> bytes:
+    """Hash the IR-defining modules; read once per process, as they don't change while it runs."""
+    digest = hashlib.sha256()
+    for path in _IR_MODULE_PATHS:
+        digest.update(path.read_bytes())
+    return digest.digest()
+
+def _temp_path(path: Path) -> Path:
+    """Get a temporary path next to path, unique to this process, to write it through."""
+    return path.with_name(f"{path.name}.{os.getpid()}.tmp")
 
 class BuildManager:
     """Manages build directories and file operations for AILang compilation."""
@@ -21,8 +63,14 @@ class BuildManager:
             build_dir: Base build directory path
         """
         self.build_dir = Path(build_dir)
+        # Resolved once so paths can be made absolute without a syscall each time
+        self.cwd = Path.cwd().resolve()
         self.artifacts: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
         self._ensure_build_structure()
+        
+        # Persist any pending metadata when the interpreter exits
+        atexit.register(self.flush)
     
     def _ensure_build_structure(self) -> None:
         """Ensure the build directory structure exists."""
@@ -31,6 +79,9 @@ class BuildManager:
         (self.build_dir / "obj").mkdir(exist_ok=True)
         (self.build_dir / "bin").mkdir(exist_ok=True)
         (self.build_dir / "logs").mkdir(exist_ok=True)
+        (self.build_dir / "cache" / "parse").mkdir(parents=True, exist_ok=True)
+        (self.build_dir / "cache" / "output").mkdir(parents=True, exist_ok=True)
+        (self.build_dir / "cache" / "bin").mkdir(parents=True, exist_ok=True)
         
         # Metadata file to track build artifacts
         self.metadata_file = self.build_dir / "build_metadata.json"
@@ -40,15 +91,21 @@ class BuildManager:
         """Load build metadata from file if it exists."""
         if self.metadata_file.exists():
             try:
-                with open(self.metadata_file, 'r') as f:
-                    self.artifacts = json.load(f)
+                with open(self.metadata_file, 'rb') as f:
+                    self.artifacts = _loads(f.read())
             except (json.JSONDecodeError, IOError):
                 self.artifacts = {}
     
     def _save_metadata(self) -> None:
         """Save build metadata to file."""
-        with open(self.metadata_file, 'w') as f:
-            json.dump(self.artifacts, f, indent=2)
+        with open(self.metadata_file, 'wb', buffering=IO_BUFFER_SIZE) as f:
+            f.write(_dumps(self.artifacts))
+        self._dirty = False
+    
+    def flush(self) -> None:
+        """Write build metadata to disk if it changed since the last save."""
+        if self._dirty:
+            self._save_metadata()
     
     def get_output_path(self, source_path: str, target: str, suffix: str = "") -> Path:
         """
@@ -67,12 +124,12 @@ class BuildManager:
         output_dir.mkdir(exist_ok=True)
         
         # Create a hash of the source file path to avoid filename collisions
-        path_hash = hashlib.md5(str(source_path).encode()).hexdigest()[:8]
+        path_hash = _path_hash(str(source_path))
         suffix = f"_{suffix}" if suffix else ""
         
         return output_dir / f"{source_path.stem}_{path_hash}{suffix}{source_path.suffix}"
     
-    def write_compiled_file(self, source_path: str, target: str, content: str, 
+    def write_compiled_file(self, source_path: str, target: str, content: Union[str, Iterable[str]], 
                           metadata: Optional[Dict[str, Any]] = None) -> Path:
         """
         Write compiled output to a file.
@@ -80,29 +137,196 @@ class BuildManager:
         Args:
             source_path: Path to the source file
             target: Target platform/language
-            content: Content to write
+            content: Content to write, either as a string or as an iterable of fragments
             metadata: Optional metadata about the compilation
             
         Returns:
             Path: Path to the written file
         """
         output_path = self.get_output_path(source_path, target)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        with open(output_path, 'w', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
+            if isinstance(content, str):
+                f.write(content)
+            else:
+                f.writelines(content)
+        
+        # The file was just written, so the current time stands in for its mtime
+        self.record_artifact(source_path, target, output_path, metadata, timestamp=time.time())
         
-        # Update metadata
-        rel_path = str(output_path.relative_to(self.build_dir))
+        return output_path
+    
+    def record_artifact(self, source_path: str, target: str, output_path: Union[str, Path],
+                        metadata: Optional[Dict[str, Any]] = None,
+                        timestamp: Optional[float] = None) -> None:
+        """
+        Record a compiled file in the build metadata.
+        
+        Args:
+            source_path: Path to the source file
+            target: Target platform/language
+            output_path: Path to the compiled file inside the build directory
+            metadata: Optional metadata about the compilation
+            timestamp: Modification time of the output, if already known
+        """
+        output_path = Path(output_path)
+        if timestamp is None:
+            timestamp = os.path.getmtime(output_path)
+        rel_path = os.path.relpath(output_path, self.build_dir)
         self.artifacts[rel_path] = {
             'source': str(source_path),
             'target': target,
-            'timestamp': str(output_path.stat().st_mtime),
+            'timestamp': str(timestamp),
             'metadata': metadata or {}
         }
-        self._save_metadata()
+        # Written once by flush() instead of after every artifact
+        self._dirty = True
+    
+    def absolute_path(self, path: Union[str, Path]) -> Path:
+        """
+        Make a path absolute against the working directory captured at startup.
         
-        return output_path
+        Unlike Path.resolve(), this does not touch the filesystem; symlinks are
+        left as they are.
+        """
+        return Path(os.path.normpath(self.cwd / path))
+    
+    def _parse_cache_path(self, source_bytes: bytes, grammar_path: Union[str, Path]) -> Path:
+        """
+        Get the cache file path for a parsed source.
+        
+        The key is derived from the content of the source, the grammar and the
+        modules that build the pickled IR (compiler/parser.py and compiler/ir.py),
+        so a change to any of them invalidates the cache, while touching a file
+        without changing it keeps the cache valid.
+        
+        Args:
+            source_bytes: Raw bytes of the source file
+            grammar_path: Path to the grammar used to parse the source
+            
+        Returns:
+            Path: Path to the cache entry (which may not exist yet)
+        """
+        digest = hashlib.sha256(source_bytes + Path(grammar_path).read_bytes())
+        digest.update(_ir_code_digest())
+        return self.build_dir / "cache" / "parse" / f"{digest.hexdigest()}.pkl"
+    
+    def get_cached_parse(self, source_bytes: bytes, grammar_path: Union[str, Path]) -> Optional[Any]:
+        """
+        Look up a previously parsed IR for the given source.
+        
+        Args:
+            source_bytes: Raw bytes of the source file
+            grammar_path: Path to the grammar used to parse the source
+            
+        Returns:
+            The cached IR, or None on a cache miss
+        """
+        cache_path = self._parse_cache_path(source_bytes, grammar_path)
+        if not cache_path.exists():
+            return None
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, IOError):
+            # Stale or corrupt entry; treat as a miss
+            return None
+    
+    def store_cached_parse(self, source_bytes: bytes, grammar_path: Union[str, Path], ir: Any) -> None:
+        """
+        Store a parsed IR in the parse cache.
+        
+        Args:
+            source_bytes: Raw bytes of the source file
+            grammar_path: Path to the grammar used to parse the source
+            ir: The parsed IR to cache
+        """
+        cache_path = self._parse_cache_path(source_bytes, grammar_path)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary name first, so an interrupted or concurrent write never
+        # leaves a truncated entry under the cache name
+        temp_path = _temp_path(cache_path)
+        try:
+            with open(temp_path, 'wb') as f:
+                pickle.dump(ir, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+    
+    def _output_cache_path(self, source_bytes: bytes, target: str, version: str) -> Path:
+        """
+        Get the cache file path for the compiled output of a source.
+        
+        Args:
+            source_bytes: Raw bytes of the source file
+            target: Target platform/language
+            version: Identifier of the transpiler that produced the output
+            
+        Returns:
+            Path: Path to the cache entry (which may not exist yet)
+        """
+        digest = hashlib.sha256(source_bytes)
+        digest.update(f"\0{target}\0{version}".encode())
+        return self.build_dir / "cache" / "output" / target / digest.hexdigest()
+    
+    def get_cached_output(self, source_bytes: bytes, target: str, version: str) -> Optional[str]:
+        """
+        Look up the compiled output of a previous build of the same source.
+        
+        Args:
+            source_bytes: Raw bytes of the source file
+            target: Target platform/language
+            version: Identifier of the transpiler that produced the output
+            
+        Returns:
+            The cached output, or None on a cache miss
+        """
+        cache_path = self._output_cache_path(source_bytes, target, version)
+        try:
+            with open(cache_path, 'r', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
+                return f.read()
+        except (FileNotFoundError, UnicodeDecodeError):
+            return None
+    
+    def store_cached_output(self, source_bytes: bytes, target: str, version: str,
+                            output_path: Union[str, Path]) -> None:
+        """
+        Store a compiled output file in the output cache.
+        
+        Args:
+            source_bytes: Raw bytes of the source file
+            target: Target platform/language
+            version: Identifier of the transpiler that produced the output
+            output_path: Path to the compiled file to cache
+        """
+        cache_path = self._output_cache_path(source_bytes, target, version)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Copy to a temporary name first, so an interrupted or concurrent copy never
+        # leaves a truncated entry to be served as a cache hit
+        temp_path = _temp_path(cache_path)
+        try:
+            shutil.copyfile(output_path, temp_path)
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+    
+    def get_cached_binary_path(self, source_bytes: bytes, flags: List[str]) -> Path:
+        """
+        Get the cache path for a native binary built from a source file.
+        
+        Args:
+            source_bytes: Raw bytes of the source file being compiled
+            flags: Compiler flags used for the build
+            
+        Returns:
+            Path: Path to the cached binary (which may not exist yet)
+        """
+        digest = hashlib.sha256(source_bytes)
+        for flag in flags:
+            digest.update(b"|" + flag.encode())
+        return self.build_dir / "cache" / "bin" / digest.hexdigest()
     
     def clean(self, target: Optional[str] = None) -> None:
         """
@@ -113,9 +337,9 @@ class BuildManager:
         """
         if target:
             # Clean specific target
-            target_dir = self.build_dir / "obj" / target
-            if target_dir.exists():
-                shutil.rmtree(target_dir)
+            for target_dir in (self.build_dir / "obj" / target, self.build_dir / "cache" / "output" / target):
+                if target_dir.exists():
+                    shutil.rmtree(target_dir)
             
             # Update metadata
             self.artifacts = {
@@ -1,29 +1,77 @@
 # Define IR classes for the compiler
 class Model:
+    __slots__ = ('name', 'layers')
+
     def __init__(self, name, layers):
         self.name = name
         self.layers = layers
 
 class Layer:
+    __slots__ = ('name', 'units', 'activation')
+
     def __init__(self, name, units, activation=None):
         self.name = name
         self.units = units
         self.activation = activation
 
 class Input:
+    __slots__ = ('name', 'shape')
+
     def __init__(self, name, shape):
         self.name = name
         self.shape = shape
 
 class TrainConfig:
+    __slots__ = ('dataset', 'epochs')
+
     def __init__(self, dataset, epochs):
         self.dataset = dataset
         self.epochs = epochs
 
 class Optimizer:
+    __slots__ = ('name',)
+
     def __init__(self, name):
         self.name = name
 
 class Loss:
+    __slots__ = ('name',)
+
     def __init__(self, name):
         self.name = name
+
+# Activations that leave a Dense layer's output unchanged
+IDENTITY_ACTIVATIONS = frozenset({'', 'linear'})
+
+def fuse_linear_layers(layers):
+    """
+    Drop Dense layers with an identity activation that don't narrow the model.
+    
+    A linear layer between two Dense layers is a rank-bounded affine map, so
+    the following layer can absorb it (with merged weights and bias) only if
+    its width is at least the smaller of its input and output widths; a
+    narrower one is a bottleneck that limits what the model can represent,
+    and is kept. The first layer (whose input width isn't known here) and
+    the last layer are always kept.
+    
+    The model has fewer parameters afterwards, so it trains differently;
+    transpilers only run this when asked to optimize.
+    """
+    last = len(layers) - 1
+    fused = []
+    for i, layer in enumerate(layers):
+        # Compared against the last kept layer, which is what feeds the next one once this is dropped
+        if (0 < i < last and (layer.activation or '').lower() in IDENTITY_ACTIVATIONS
+                and layer.units >= min(fused[-1].units, layers[i + 1].units)):
+            continue
+        fused.append(layer)
+    return fused
+
+# Opt-in rewrite passes applied to a model's layer list before code generation, in order
+LAYER_PASSES = (fuse_linear_layers,)
+
+def optimize_layers(layers):
+    """Apply every pass in LAYER_PASSES to a model's layers and return the rewritten list."""
+    for rewrite in LAYER_PASSES:
+        layers = rewrite(layers)
+    return layers
@@ -1,8 +1,51 @@
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
 from lark import Lark
 
-# Load grammar from grammar.lark
-with open("d:\\vscode\\ailang\\compiler\\grammar.lark", "r") as grammar_file:
-    grammar = grammar_file.read()
+# Grammar shipped alongside this module
+GRAMMAR_PATH = Path(__file__).with_name("grammar.lark")
+
+# Precomputed parsing table shipped with the package (see build_grammar.py)
+TABLE_PATH = Path(__file__).with_name("grammar_table.pkl")
+
+# Lark stores the compiled LALR tables here and rebuilds them only when the grammar changes.
+# It lives in the user's cache directory, since the package directory may be read-only
+CACHE_PATH = Path("~/.cache/ailang/lark_grammar.pkl").expanduser()
+
+def _grammar_digest() -> bytes:
+    """Hash of the grammar source, used to detect a stale parsing table."""
+    return hashlib.sha256(GRAMMAR_PATH.read_bytes()).hexdigest().encode()
+
+def _build_lexer() -> Lark:
+    """Build the Lark parser from the grammar source, without the cache if it can't be created."""
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        cache = str(CACHE_PATH)
+    except OSError:
+        cache = False
+    return Lark.open(str(GRAMMAR_PATH), start="start", parser="lalr", cache=cache)
+
+def save_grammar_table(path: Path = TABLE_PATH) -> Path:
+    """Build the parser and save its parsing table, tagged with the grammar hash."""
+    with open(path, "wb") as f:
+        f.write(_grammar_digest() + b"\n")
+        _build_lexer().save(f)
+    return path
+
+@lru_cache(maxsize=1)
+def get_lexer() -> Lark:
+    """
+    Get the Lark parser, creating it on first use and sharing it for the rest of the process.
 
-# Initialize the Lark parser
-lexer = Lark(grammar, start="start", parser="lalr")
+    The precomputed parsing table is used when it matches the current grammar;
+    otherwise the parser is built from the grammar (through Lark's cache).
+    """
+    try:
+        with open(TABLE_PATH, "rb") as f:
+            if f.readline().rstrip(b"\n") == _grammar_digest():
+                return Lark.load(f)
+    except FileNotFoundError:
+        pass
+    return _build_lexer()
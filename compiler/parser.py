@@ -1,17 +1,6 @@
 from lark import Transformer, Tree
-from .lexer import lexer
-
-# Define custom Python classes for the IR
-class Model:
-    def __init__(self, name, layers):
-        self.name = name
-        self.layers = layers
-
-class Layer:
-    def __init__(self, name, units, activation=None):
-        self.name = name
-        self.units = units
-        self.activation = activation
+from .ir import Model, Layer
+from .lexer import get_lexer
 
 # Transformer to convert Lark tree into IR objects
 class IRTransformer(Transformer):
@@ -28,5 +17,5 @@ class IRTransformer(Transformer):
 
 # Parse input text and transform it into IR
 def parse(input_text):
-    tree = lexer.parse(input_text)
+    tree = get_lexer().parse(input_text)
     return IRTransformer().transform(tree)
@@ -3,25 +3,31 @@ C++ transpiler for AILang.
 Converts AILang IR to C++ code using Eigen for matrix operations.
 """
 
+from functools import lru_cache
+
+from ..ir import optimize_layers
+
+# Map AILang activation names to the C++ activation names used by the Dense layer
+_ACT = {
+    'relu': 'relu',
+    'sigmoid': 'sigmoid',
+    'tanh': 'tanh',
+    'softmax': 'softmax',
+}
+
+@lru_cache(maxsize=32)
 def _get_activation_function(activation):
     """Get the corresponding activation function name in C++."""
-    if not activation:
-        return ""
-    
-    activation = activation.lower()
-    if activation == 'relu':
-        return "relu"
-    elif activation == 'sigmoid':
-        return "sigmoid"
-    elif activation == 'tanh':
-        return "tanh"
-    elif activation == 'softmax':
-        return "softmax"
-    return ""
-
-def _generate_includes():
-    """Generate necessary includes for the C++ code."""
-    return """#include <Eigen/Dense>
+    return _ACT.get((activation or '').lower(), '')
+
+@lru_cache(maxsize=32)
+def _get_activation_param(activation):
+    """Get the trailing activation argument for a Dense constructor call, or '' for none."""
+    activation = _get_activation_function(activation)
+    return f', "{activation}"' if activation else ''
+
+# Necessary includes for the C++ code
+_INCLUDES = """#include <Eigen/Dense>
 #include <vector>
 #include <string>
 #include <stdexcept>
@@ -38,9 +44,8 @@ VectorXf softmax(const VectorXf& x);
 
 """
 
-def _generate_activation_functions():
-    """Generate activation function implementations."""
-    return """// Activation functions
+# Activation function implementations
+_ACTIVATIONS = """// Activation functions
 float relu(float x) {
     return std::max(0.0f, x);
 }
@@ -60,9 +65,8 @@ VectorXf softmax(const VectorXf& x) {
 
 """
 
-def _generate_layer_class():
-    """Generate the Layer base class and Dense layer implementation."""
-    return """// Base class for all layers
+# Layer base class and Dense layer implementation
+_LAYER_CLASS = """// Base class for all layers
 class Layer {
 public:
     virtual ~Layer() = default;
@@ -107,9 +111,8 @@ private:
 
 """
 
-def _generate_model_class():
-    """Generate the Model class that holds and executes layers."""
-    return """// Neural Network Model
+# Model class that holds and executes layers
+_MODEL_CLASS = """// Neural Network Model
 class Model {
 public:
     void addLayer(std::unique_ptr<Layer> layer) {
@@ -130,23 +133,30 @@ private:
 
 """
 
-def _generate_model_definition(model):
-    """Generate model definition code from IR."""
-    lines = [f'// Model: {model.name}', 'void setupModel(Model& model) {']
+def _generate_model_definition(model, optimize=False):
+    """
+    Yield the model definition code for the given IR model, one line at a time,
+    after the IR rewrite passes if optimize is set.
+    """
+    yield f'// Model: {model.name}'
+    yield 'void setupModel(Model& model) {'
+    
+    # Each layer consumes the previous layer's output. The IR carries no model input
+    # size, so the first layer is given its own width.
+    # IR rewrite passes may drop layers, so sizes are computed on the rewritten list
+    layers = optimize_layers(model.layers) if optimize else model.layers
+    input_sizes = [layer.units for layer in layers[:1]]
+    input_sizes.extend(layer.units for layer in layers[:-1])
     
     # Add layers
-    for i, layer in enumerate(model.layers):
-        activation = _get_activation_function(layer.activation)
-        activation_param = f', "{activation}"' if activation else ''
-        lines.append(f'    model.addLayer(std::make_unique<Dense>(/* input_size */ {layer.units if i == 0 else model.layers[i-1].units}, ' \
-                   f'/* output_size */ {layer.units}{activation_param}));')
+    for input_size, layer in zip(input_sizes, layers):
+        yield (f'    model.addLayer(std::make_unique<Dense>(/* input_size */ {input_size}, '
+               f'/* output_size */ {layer.units}{_get_activation_param(layer.activation)}));')
     
-    lines.append('}')
-    return '\n'.join(lines)
+    yield '}'
 
-def _generate_main_function():
-    """Generate the main function with example usage."""
-    return """
+# Main function with example usage
+_MAIN_FUNCTION = """
 int main() {
     // Initialize model
     Model model;
@@ -161,29 +171,51 @@ int main() {
 }
 """
 
-def transpile_to_cpp(ir):
+def _generate_parts(ir, optimize=False):
+    """Yield every top-level code fragment of the C++ program in order."""
+    yield _INCLUDES
+    yield _ACTIVATIONS
+    yield _LAYER_CLASS
+    yield _MODEL_CLASS
+    
+    # Handle different IR components
+    for model in getattr(ir, 'models', ()):
+        yield from _generate_model_definition(model, optimize)
+    
+    yield _MAIN_FUNCTION
+
+def iter_transpile_to_cpp(ir, optimize=False):
+    """
+    Convert AILang IR to C++ code using Eigen, yielding the code in fragments.
+    
+    Concatenating the fragments gives the same code as transpile_to_cpp, so
+    callers can write it out with writelines() without building the whole
+    program in memory.
+    
+    Args:
+        ir: The intermediate representation (IR) of the AILang program
+        optimize: Apply the IR rewrite passes (see compiler.ir.LAYER_PASSES),
+            which may drop layers, before generating the layers
+        
+    Yields:
+        str: Consecutive fragments of the generated C++ code
+    """
+    parts = _generate_parts(ir, optimize)
+    yield next(parts)
+    for part in parts:
+        yield '\n'
+        yield part
+
+def transpile_to_cpp(ir, optimize=False):
     """
     Convert AILang IR to C++ code using Eigen.
     
     Args:
         ir: The intermediate representation (IR) of the AILang program
+        optimize: Apply the IR rewrite passes (see compiler.ir.LAYER_PASSES),
+            which may drop layers, before generating the layers
         
     Returns:
         str: Generated C++ code as a string
     """
-    code_parts = [
-        _generate_includes(),
-        _generate_activation_functions(),
-        _generate_layer_class(),
-        _generate_model_class()
-    ]
-    
-    # Handle different IR components
-    if hasattr(ir, 'models'):
-        for model in ir.models:
-            code_parts.append(_generate_model_definition(model))
-    
-    code_parts.append(_generate_main_function())
-    
-    # Join all code parts and remove empty lines
-    return '\n'.join(filter(None, code_parts))
+    return ''.join(iter_transpile_to_cpp(ir, optimize))
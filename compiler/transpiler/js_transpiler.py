@@ -3,19 +3,27 @@ JavaScript transpiler for AILang.
 Converts AILang IR to TensorFlow.js code.
 """
 
+import io
+from functools import lru_cache
+
+from ..ir import optimize_layers
+
+# Sentinel for optional IR attributes, so a present-but-None value still counts as set
+_MISSING = object()
+
+# Activation layer expressions for the activations supported by TensorFlow.js,
+# built once at import time
+_ACTIVATIONS = {
+    activation: f'tf.layers.activation({{activation: "{activation}"}})'
+    for activation in ('relu', 'sigmoid', 'tanh', 'softmax')
+}
+
 def _get_activation_function(activation):
     """Get the corresponding TensorFlow.js activation function name."""
-    if not activation:
-        return None
-    
-    activation = activation.lower()
-    if activation in ['relu', 'sigmoid', 'tanh', 'softmax']:
-        return f'tf.layers.activation({{activation: "{activation}"}})'
-    return None
-
-def _generate_imports():
-    """Generate necessary imports for TensorFlow.js."""
-    return """// Import TensorFlow.js
+    return _ACTIVATIONS.get(activation.lower()) if activation else None
+
+# Necessary imports for TensorFlow.js
+_IMPORTS = """// Import TensorFlow.js
 const tf = require('@tensorflow/tfjs');
 
 // Add a global model variable
@@ -23,52 +31,76 @@ let model;
 
 """
 
-def _generate_model_definition(model):
-    """Generate model definition code from IR."""
-    lines = [f'// Model: {model.name}', 'function createModel() {', '  const model = tf.sequential();', '  ']
-    
+# Templates for the generated model definition
+_MODEL_TMPL = """// Model: {name}
+function createModel() {{
+  const model = tf.sequential();
+  
+{input_layer}{layers}{compilation}  
+  return model;
+}}"""
+
+_INPUT_TMPL = '  model.add(tf.layers.inputLayer({{shape: {shape}}}));\n'
+
+_LAYER_TMPL = """  model.add(tf.layers.dense({{
+    units: {units}{activation}
+  }}));
+"""
+
+_COMPILE_TMPL = """
+  // Compile the model
+  model.compile({{
+    optimizer: tf.train.{optimizer}(),
+    loss: "{loss}",
+    metrics: ["accuracy"]
+  }});
+"""
+
+@lru_cache(maxsize=256)
+def _format_dense_line(units, activation):
+    """Format the dense layer call for a layer; identical layers across models share one string."""
+    return _LAYER_TMPL.format(
+        units=units,
+        activation=f',\n    activation: "{activation.lower()}"'
+        if _get_activation_function(activation) else ''
+    )
+
+def _generate_model_definition(model, optimize=False):
+    """Generate model definition code from IR, after the IR rewrite passes if optimize is set."""
     # Add input layer if specified
-    if hasattr(model, 'input_shape'):
-        lines.append(f'  model.add(tf.layers.inputLayer({{shape: {model.input_shape}}}));')
+    input_shape = getattr(model, 'input_shape', _MISSING)
+    input_layer = _INPUT_TMPL.format(shape=input_shape) if input_shape is not _MISSING else ''
     
     # Add layers
-    for layer in model.layers:
-        activation = _get_activation_function(layer.activation)
-        
-        layer_config = f'    units: {layer.units}'
-        if activation:
-            layer_config += f',\n    activation: "{layer.activation}"'
-        
-        lines.append(f'  model.add(tf.layers.dense({{{layer_config}
-  }}));')
+    layers = optimize_layers(model.layers) if optimize else model.layers
+    layers = ''.join(_format_dense_line(layer.units, layer.activation) for layer in layers)
     
     # Add model compilation
-    if hasattr(model, 'optimizer') and hasattr(model, 'loss'):
-        lines.append('')
-        lines.append(f'  // Compile the model\n  model.compile({{')
-        lines.append(f'    optimizer: tf.train.{model.optimizer.name.lower()}(),')
-        lines.append(f'    loss: "{model.loss.name.lower()}",')
-        lines.append('    metrics: ["accuracy"]')
-        lines.append('  });')
-    
-    lines.append('  ')
-    lines.append('  return model;')
-    lines.append('}')
+    compilation = ''
+    optimizer = getattr(model, 'optimizer', _MISSING)
+    loss = getattr(model, 'loss', _MISSING)
+    if optimizer is not _MISSING and loss is not _MISSING:
+        compilation = _COMPILE_TMPL.format(
+            optimizer=optimizer.name.lower(),
+            loss=loss.name.lower()
+        )
     
-    return '\n'.join(lines)
+    return _MODEL_TMPL.format(
+        name=model.name, input_layer=input_layer, layers=layers, compilation=compilation
+    )
 
 def _generate_training_function(model):
     """Generate training function if training config exists."""
-    if not hasattr(model, 'train_config'):
+    train_cfg = getattr(model, 'train_config', _MISSING)
+    if train_cfg is _MISSING:
         return ""
     
-    train_cfg = model.train_config
     return f"""
 // Train the model
 async function trainModel() {{
   // Example training data - replace with your actual data
-  const xs = tf.randomNormal([100, {train_cfg.input_shape if hasattr(train_cfg, 'input_shape') else 'input_size'}]);
-  const ys = tf.randomNormal([100, {train_cfg.output_units if hasattr(train_cfg, 'output_units') else 'output_units'}]);
+  const xs = tf.randomNormal([100, {getattr(train_cfg, 'input_shape', 'input_size')}]);
+  const ys = tf.randomNormal([100, {getattr(train_cfg, 'output_units', 'output_units')}]);
   
   // Train the model
   const history = await model.fit(xs, ys, {{
@@ -86,9 +118,8 @@ async function trainModel() {{
 }}
 """
 
-def _generate_usage_example():
-    """Generate example usage code."""
-    return """
+# Example usage code
+_USAGE_EXAMPLE = """
 // Initialize and use the model
 async function main() {
   try {
@@ -119,28 +150,33 @@ async function main() {
 main().catch(console.error);
 """
 
-def transpile_to_js(ir):
+def transpile_to_js(ir, optimize=False):
     """
     Convert AILang IR to TensorFlow.js code.
     
     Args:
         ir: The intermediate representation (IR) of the AILang program
+        optimize: Apply the IR rewrite passes (see compiler.ir.LAYER_PASSES),
+            which may drop layers, before generating the layers
         
     Returns:
         str: Generated JavaScript code as a string
     """
-    code_parts = [_generate_imports()]
+    buf = io.StringIO()
+    write = buf.write
+    write(_IMPORTS)
     
     # Handle different IR components
-    if hasattr(ir, 'models'):
-        for model in ir.models:
-            code_parts.append(_generate_model_definition(model))
-            training_code = _generate_training_function(model)
-            if training_code:
-                code_parts.append(training_code)
+    for model in getattr(ir, 'models', ()):
+        write('\n')
+        write(_generate_model_definition(model, optimize))
+        training_code = _generate_training_function(model)
+        if training_code:
+            write('\n')
+            write(training_code)
     
     # Add usage example
-    code_parts.append(_generate_usage_example())
+    write('\n')
+    write(_USAGE_EXAMPLE)
     
-    # Join all code parts and remove empty lines
-    return '\n'.join(filter(None, code_parts))
+    return buf.getvalue()
@@ -3,6 +3,15 @@ Python transpiler for AILang.
 Converts AILang IR to Keras Sequential model code.
 """
 
+import io
+from functools import lru_cache, partial
+
+from ..ir import optimize_layers
+
+# Sentinel for optional IR attributes, so a present-but-None value still counts as set
+_MISSING = object()
+
+@lru_cache(maxsize=32)
 def _get_activation(activation):
     """Convert AILang activation to Keras activation string."""
     if not activation:
@@ -16,42 +25,56 @@ from tensorflow.keras.layers import Dense, Input
 
 """
 
-def _generate_model_definition(model):
-    """Generate model definition code from IR."""
-    lines = [f'# Model: {model.name}', 'model = Sequential([']
-    
+# Templates for the generated model definition
+_MODEL_TMPL = """# Model: {name}
+model = Sequential([
+{input_layer}{layers}])"""
+
+_INPUT_TMPL = '    Input(shape={shape}),\n'
+
+_LAYER_TMPL = '    Dense({units}{activation}),\n'
+
+@lru_cache(maxsize=256)
+def _format_dense_line(units, activation):
+    """Format the Dense line for a layer; identical layers across models share one string."""
+    return _LAYER_TMPL.format(
+        units=units,
+        activation=f', activation="{_get_activation(activation)}"' if activation else ''
+    )
+
+def _generate_model_definition(model, optimize=False):
+    """Generate model definition code from IR, after the IR rewrite passes if optimize is set."""
     # Add input layer if specified
-    if hasattr(model, 'input_shape'):
-        lines.append(f'    Input(shape={model.input_shape}),')
+    input_shape = getattr(model, 'input_shape', _MISSING)
+    input_layer = _INPUT_TMPL.format(shape=input_shape) if input_shape is not _MISSING else ''
     
     # Add layers
-    for layer in model.layers:
-        activation = _get_activation(layer.activation)
-        activation_str = f', activation="{activation}"' if activation else ''
-        lines.append(f'    Dense({layer.units}{activation_str}),')
+    layers = optimize_layers(model.layers) if optimize else model.layers
+    layers = ''.join(_format_dense_line(layer.units, layer.activation) for layer in layers)
     
-    lines.append('])')
-    return '\n'.join(lines)
+    return _MODEL_TMPL.format(name=model.name, input_layer=input_layer, layers=layers)
 
 def _generate_compilation(model):
-    """Generate model compilation code."""
-    if not hasattr(model, 'optimizer') or not hasattr(model, 'loss'):
-        return ""
+    """Generate model compilation code, or None if the model lacks an optimizer or loss."""
+    optimizer = getattr(model, 'optimizer', _MISSING)
+    loss = getattr(model, 'loss', _MISSING)
+    if optimizer is _MISSING or loss is _MISSING:
+        return None
     
     return f'''
 # Compile the model
 model.compile(
-    optimizer='{model.optimizer.name.lower()}',
-    loss='{model.loss.name.lower()}',
+    optimizer='{optimizer.name.lower()}',
+    loss='{loss.name.lower()}',
     metrics=['accuracy']
 )'''
 
 def _generate_training(model):
-    """Generate training code if training config exists."""
-    if not hasattr(model, 'train_config'):
-        return ""
+    """Generate training code, or None if the model has no training config."""
+    train_cfg = getattr(model, 'train_config', _MISSING)
+    if train_cfg is _MISSING:
+        return None
     
-    train_cfg = model.train_config
     return f'''
 # Train the model
 model.fit(
@@ -62,24 +85,71 @@ model.fit(
     validation_data=({train_cfg.dataset}.test_data, {train_cfg.dataset}.test_labels)
 )'''
 
-def transpile_to_python(ir):
+# Per-model code generators, in output order
+_MODEL_GENERATORS = (_generate_model_definition, _generate_compilation, _generate_training)
+
+def transpile_to_python(ir, optimize=False):
     """
     Convert AILang IR to Keras Python code.
     
     Args:
         ir: The intermediate representation (IR) of the AILang program
+        optimize: Apply the IR rewrite passes (see compiler.ir.LAYER_PASSES),
+            which may drop layers, before generating the layers
         
     Returns:
         str: Generated Python code as a string
     """
-    code_parts = [_generate_imports()]
+    buf = io.StringIO()
+    write = buf.write
+    write(_generate_imports())
     
-    # Handle different IR components
-    if hasattr(ir, 'models'):
-        for model in ir.models:
-            code_parts.append(_generate_model_definition(model))
-            code_parts.append(_generate_compilation(model))
-            code_parts.append(_generate_training(model))
+    generators = _MODEL_GENERATORS
+    if optimize:
+        generators = (partial(_generate_model_definition, optimize=True),) + generators[1:]
     
-    # Join all code parts and remove empty lines
-    return '\n'.join(filter(None, code_parts))
+    # Handle different IR components; generators return None for parts a model doesn't have
+    for model in getattr(ir, 'models', ()):
+        for generate in generators:
+            part = generate(model)
+            if part is not None:
+                write('\n')
+                write(part)
+    
+    return buf.getvalue()
+
+def transpile_dict_to_python(model_ir):
+    """
+    Convert a model dictionary (as produced by ``ModelIR.to_dict``) to a Keras
+    Sequential subclass.
+    
+    Args:
+        model_ir: Dictionary with 'name', 'input', 'layers' and 'train_config' keys
+        
+    Returns:
+        str: Generated Python code as a string
+    """
+    # Each line carries its own indentation and newline, so the join needs no separator
+    layers_code = "".join(
+        f"        self.layers.append(Dense({layer['units']}, activation='{layer['activation']}'))\n"
+        for layer in model_ir["layers"]
+    )
+    train_code = (
+        f"""
+        model.compile(optimizer='adam', loss='mse')
+        model.fit(x_train, y_train, epochs={model_ir['train_config']['epochs']}, batch_size={model_ir['train_config']['batch_size']})
+        """
+        if model_ir["train_config"]
+        else ""
+    )
+    return f"""
+import tensorflow as tf
+from tensorflow.keras import Sequential
+from tensorflow.keras.layers import Dense
+
+class {model_ir['name']}(Sequential):
+    def __init__(self):
+        super().__init__()
+        self.add(tf.keras.Input(shape=({model_ir['input']['size']},)))
+{layers_code}        {train_code}
+"""
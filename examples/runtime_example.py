@@ -5,56 +5,86 @@ a simple neural network on the MNIST dataset.
 """
 
 import os
+import sys
 import numpy as np
 from pathlib import Path
 
-# Add the project root to the Python path
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-# Try to import the runtime
-try:
-    from runtime import get_runtime, AIRuntime
-except ImportError as e:
-    print(f"Error importing runtime: {e}")
-    print("Make sure you're running from the project root directory.")
-    sys.exit(1)
-
-# Try to import TensorFlow and Keras
-try:
-    import tensorflow as tf
-    from tensorflow.keras.datasets import mnist
-    from tensorflow.keras.utils import to_categorical
-    TF_AVAILABLE = True
-except ImportError:
-    TF_AVAILABLE = False
-    print("TensorFlow is required for this example. Install with: pip install tensorflow")
+# TensorFlow and the runtime are imported inside the functions that use them,
+# so importing this module (e.g. for introspection) stays cheap
+
+
+def one_hot(labels, num_classes):
+    """One-hot encode integer labels into a float32 matrix."""
+    encoded = np.zeros((len(labels), num_classes), dtype=np.float32)
+    encoded[np.arange(len(labels)), labels] = 1.0
+    return encoded
+
 
+# Preprocessed MNIST arrays are cached here as .npy files after the first run
+MNIST_CACHE_DIR = Path('~/.cache/ailang/mnist').expanduser()
+MNIST_ARRAYS = ('x_train', 'y_train', 'x_test', 'y_test')
 
-def load_mnist_data():
-    """Load and preprocess the MNIST dataset."""
-    if not TF_AVAILABLE:
-        raise ImportError("TensorFlow is required to load the MNIST dataset")
+
+def load_mnist_data(cache_dir=MNIST_CACHE_DIR):
+    """Load and preprocess the MNIST dataset.
+    
+    The preprocessed arrays are saved to ``cache_dir`` on the first run and
+    memory-mapped (read-only) from there afterwards, which skips the download,
+    decompression and float conversion.
+    """
+    cache_dir = Path(cache_dir)
+    cache_paths = [cache_dir / f'{name}.npy' for name in MNIST_ARRAYS]
+    if all(path.exists() for path in cache_paths):
+        x_train, y_train, x_test, y_test = (np.load(path, mmap_mode='r') for path in cache_paths)
+        return (x_train, y_train), (x_test, y_test)
+    
+    try:
+        from tensorflow.keras.datasets import mnist
+    except ImportError as e:
+        raise ImportError(
+            "TensorFlow is required to load the MNIST dataset. Install with: pip install tensorflow"
+        ) from e
     
     # Load the MNIST dataset
     (x_train, y_train), (x_test, y_test) = mnist.load_data()
     
-    # Preprocess the data
-    x_train = x_train.astype('float32') / 255.0
-    x_test = x_test.astype('float32') / 255.0
+    # Preprocess the data: a single float32 copy, then scale it in place
+    scale = np.float32(1.0 / 255.0)
+    x_train = x_train.astype(np.float32, copy=False)
+    x_train *= scale
+    x_test = x_test.astype(np.float32, copy=False)
+    x_test *= scale
     
-    # Add channel dimension (for CNN)
-    x_train = np.expand_dims(x_train, -1)
-    x_test = np.expand_dims(x_test, -1)
+    # Add channel dimension (for CNN) as a view, without copying
+    x_train = x_train[..., np.newaxis]
+    x_test = x_test[..., np.newaxis]
     
     # Convert class vectors to one-hot encoded targets
     num_classes = 10
-    y_train = to_categorical(y_train, num_classes)
-    y_test = to_categorical(y_test, num_classes)
+    y_train = one_hot(y_train, num_classes)
+    y_test = one_hot(y_test, num_classes)
+    
+    # Write each array to a temporary file first so an interrupted run can't leave a truncated cache
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for path, array in zip(cache_paths, (x_train, y_train, x_test, y_test)):
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
     
     return (x_train, y_train), (x_test, y_test)
 
 
+def make_dataset(x, y, batch_size, shuffle=False):
+    """Build a batched tf.data pipeline that prepares the next batch while the current one trains."""
+    import tensorflow as tf
+    
+    dataset = tf.data.Dataset.from_tensor_slices((x, y))
+    if shuffle:
+        dataset = dataset.shuffle(10000)
+    return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+
 def create_model_config():
     """Create a model configuration for a simple CNN."""
     return {
@@ -63,31 +93,19 @@ def create_model_config():
         },
         'layers': [
             {
-                'type': 'conv2d',
+                # Fused conv + relu + max-pool block
+                'type': 'conv_relu_pool',
                 'params': {
                     'filters': 32,
                     'kernel_size': (3, 3),
-                    'activation': 'relu',
-                    'input_shape': (28, 28, 1)
-                }
-            },
-            {
-                'type': 'maxpool2d',
-                'params': {
                     'pool_size': (2, 2)
                 }
             },
             {
-                'type': 'conv2d',
+                'type': 'conv_relu_pool',
                 'params': {
                     'filters': 64,
                     'kernel_size': (3, 3),
-                    'activation': 'relu'
-                }
-            },
-            {
-                'type': 'maxpool2d',
-                'params': {
                     'pool_size': (2, 2)
                 }
             },
@@ -162,6 +180,15 @@ def create_model_config():
 
 
 def main():
+    # Add the project root to the Python path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    try:
+        from runtime import get_runtime
+    except ImportError as e:
+        print(f"Error importing runtime: {e}")
+        print("Make sure you're running from the project root directory.")
+        sys.exit(1)
+    
     # Create output directory
     os.makedirs('models', exist_ok=True)
     
@@ -185,13 +212,14 @@ def main():
     
     # Train the model
     print("\nTraining model...")
+    batch_size = model_config.get('batch_size', 128)
+    train_ds = make_dataset(x_train, y_train, batch_size, shuffle=True)
+    val_ds = make_dataset(x_test[:5000], y_test[:5000], batch_size)  # Use part of test set as validation
     history = runtime.train(
-        x_train,
-        y_train,
-        x_val=x_test[:5000],  # Use part of test set as validation
-        y_val=y_test[:5000],
+        train_ds,
+        None,
+        x_val=val_ds,
         epochs=model_config.get('epochs', 10),
-        batch_size=model_config.get('batch_size', 128),
         verbose=1
     )
     
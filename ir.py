@@ -1,25 +1,48 @@
-class Input:
-    def __init__(self, size):
-        self.size = size
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional, Tuple
 
-class Layer:
-    def __init__(self, units, activation):
-        self.units = units
-        self.activation = activation
+# Leaf nodes declare __slots__ by hand since dataclass(slots=True) needs Python 3.10
+class _SlottedNode:
+    __slots__ = ()
 
-class TrainConfig:
-    def __init__(self, epochs, batch_size):
-        self.epochs = epochs
-        self.batch_size = batch_size
+    def __reduce__(self):
+        # Frozen slotted instances can't be restored through setattr, so rebuild via __init__
+        return (self.__class__, tuple(getattr(self, name) for name in self.__slots__))
 
+@dataclass(frozen=True)
+class Input(_SlottedNode):
+    __slots__ = ("size",)
+    size: int
+
+@dataclass(frozen=True)
+class Layer(_SlottedNode):
+    __slots__ = ("units", "activation")
+    units: int
+    activation: str
+
+@dataclass(frozen=True)
+class TrainConfig(_SlottedNode):
+    __slots__ = ("epochs", "batch_size")
+    epochs: int
+    batch_size: int
+
+# No __slots__ here: as_dict caches into the instance __dict__
+@dataclass(frozen=True)
 class ModelIR:
-    def __init__(self, name, input, layers, train_config=None):
-        self.name = name
-        self.input = input
-        self.layers = layers
-        self.train_config = train_config
+    name: str
+    input: Input
+    layers: Tuple[Layer, ...]
+    train_config: Optional[TrainConfig] = None
 
-    def to_dict(self):
+    def __post_init__(self):
+        # Store layers as a tuple so the whole IR is immutable and hashable
+        if not isinstance(self.layers, tuple):
+            object.__setattr__(self, "layers", tuple(self.layers))
+
+    @cached_property
+    def as_dict(self):
+        # Built once per model; the IR is treated as immutable after construction
         return {
             "name": self.name,
             "input": {"size": self.input.size},
@@ -30,6 +53,9 @@ class ModelIR:
             } if self.train_config else None,
         }
 
+    def to_dict(self):
+        return self.as_dict
+
     def to_python(self):
         layers_code = "\n    ".join(
             f"model.add(Dense({layer.units}, activation='{layer.activation}'))"
@@ -51,6 +77,6 @@ def from_parsed(parsed):
     return ModelIR(
         name=parsed["name"],
         input=Input(parsed["input"]["size"]),
-        layers=[Layer(l["units"], l["activation"]) for l in parsed["layers"]],
+        layers=tuple(Layer(l["units"], l["activation"]) for l in parsed["layers"]),
         train_config=TrainConfig(parsed["train_config"]["epochs"], parsed["train_config"]["batch_size"]) if parsed.get("train_config") else None
     )
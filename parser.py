@@ -1,9 +1,10 @@
+import os
+from functools import lru_cache
+from pathlib import Path
+
 from lark import Lark, Transformer
 from ir import ModelIR, Input, Layer, TrainConfig
 
-grammar = open("d:\\vscode\\ailang\\grammar.lark").read()
-ail_parser = Lark(grammar, start="start")
-
 class AILTransformer(Transformer):
     def model_block(self, items):
         name, input_block, *layer_blocks = items
@@ -27,6 +28,27 @@ class AILTransformer(Transformer):
         return ModelIR(
             name=model["name"],
             input=model["input"],
-            layers=model["layers"],
+            layers=tuple(model["layers"]),
             train_config=train_config,
         )
+
+@lru_cache(maxsize=1)
+def get_parser():
+    """
+    Build the Lark parser on first use; AILANG_GRAMMAR overrides the grammar path.
+
+    The transformer runs inline with the LALR reductions, so parse() returns a
+    ModelIR directly without building an intermediate parse tree.
+    """
+    path = os.environ.get("AILANG_GRAMMAR", Path(__file__).resolve().parent / "grammar.lark")
+    grammar = Path(path).read_text(encoding="utf-8")
+    return Lark(grammar, start="start", parser="lalr", transformer=AILTransformer(), cache=True)
+
+def parse(source):
+    """Parse AILang source into a ModelIR."""
+    return get_parser().parse(source)
+
+def parse_many(sources):
+    """Parse several AILang sources with one shared parser, returning their ModelIRs in order."""
+    parser = get_parser()
+    return [parser.parse(source) for source in sources]
@@ -2,7 +2,9 @@
 
 This module provides an interface for executing AILang models on different backends.
 """
-from typing import Dict, Type, Any, Optional
+from typing import Dict, Type, Any, Optional, Tuple
+from functools import lru_cache
+from importlib.metadata import entry_points
 import importlib
 import os
 import sys
@@ -12,6 +14,28 @@ from .base_runtime import AIRuntime
 # Runtime registry mapping backend names to runtime classes
 _RUNTIME_REGISTRY: Dict[str, Type[AIRuntime]] = {}
 
+# Built-in runtimes whose module or class name doesn't follow the
+# runtime.<backend>.runtime / <Backend>Runtime convention. They are imported
+# on first use so that importing this package doesn't pull in TensorFlow.
+_LAZY_RUNTIMES: Dict[str, Tuple[str, str]] = {
+    'python': ('runtime.py.runtime', 'KerasRuntime'),
+}
+
+# Entry point group third-party packages use to provide runtimes, e.g.
+#   [tool.poetry.plugins."ailang.runtimes"]
+#   mybackend = "mypackage.runtime:MyRuntime"
+ENTRY_POINT_GROUP = 'ailang.runtimes'
+
+@lru_cache(maxsize=1)
+def _discover_runtimes() -> Dict[str, Any]:
+    """Return the installed runtime entry points, keyed by backend name."""
+    try:
+        eps = entry_points(group=ENTRY_POINT_GROUP)
+    except TypeError:
+        # Python < 3.10 only returns a dict of groups
+        eps = entry_points().get(ENTRY_POINT_GROUP, ())
+    return {ep.name: ep for ep in eps}
+
 def register_runtime(backend: str, runtime_class: Type[AIRuntime]) -> None:
     """Register a runtime class for a specific backend.
     
@@ -35,16 +59,30 @@ def get_runtime(backend: str, model_config: Dict[str, Any]) -> AIRuntime:
         ValueError: If the specified backend is not supported
         ImportError: If required dependencies for the backend are not installed
     """
-    # Try to import the runtime module if not already registered
+    # Installed packages can provide a runtime through an entry point
+    if backend not in _RUNTIME_REGISTRY:
+        entry_point = _discover_runtimes().get(backend)
+        if entry_point is not None:
+            try:
+                register_runtime(backend, entry_point.load())
+            except ImportError as e:
+                raise ImportError(
+                    f"Could not import runtime for backend '{backend}' "
+                    f"from entry point '{entry_point.value}'. Error: {e}"
+                ) from e
+    
+    # Otherwise try to import the runtime module if not already registered
     if backend not in _RUNTIME_REGISTRY:
         try:
-            module_name = f"runtime.{backend}.runtime"
+            module_name, class_name = _LAZY_RUNTIMES.get(
+                backend, (f"runtime.{backend}.runtime", f"{backend.capitalize()}Runtime")
+            )
             module = importlib.import_module(module_name)
-            runtime_class = getattr(module, f"{backend.capitalize()}Runtime", None)
+            runtime_class = getattr(module, class_name, None)
             
             if runtime_class is None:
                 raise ValueError(
-                    f"Could not find {backend.capitalize()}Runtime class in {module_name}"
+                    f"Could not find {class_name} class in {module_name}"
                 )
                 
             register_runtime(backend, runtime_class)
@@ -58,14 +96,5 @@ def get_runtime(backend: str, model_config: Dict[str, Any]) -> AIRuntime:
     # Create and return a new runtime instance
     return _RUNTIME_REGISTRY[backend](model_config)
 
-# Register built-in runtimes
-try:
-    from .py.runtime import KerasRuntime
-    register_runtime('python', KerasRuntime)
-except ImportError:
-    # Keras/TensorFlow not available, but don't fail here
-    # The runtime will be loaded dynamically when needed
-    pass
-
 # Export the AIRuntime class for direct import from runtime module
 __all__ = ['AIRuntime', 'get_runtime', 'register_runtime']
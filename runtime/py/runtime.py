@@ -7,10 +7,20 @@ defined in the AILang DSL.
 
 import os
 import json
+import math
+import inspect
+import contextlib
+from functools import lru_cache
 import numpy as np
-from typing import Dict, Any, Optional, Tuple, Union, List
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Tuple, Union, List, Mapping, Set
 from pathlib import Path
 
+# TensorFlow reads these at import time: use oneDNN kernels on CPU and let cuDNN
+# benchmark convolution algorithms per shape. Values set by the user win.
+os.environ.setdefault('TF_ENABLE_ONEDNN_OPTS', '1')
+os.environ.setdefault('TF_CUDNN_USE_AUTOTUNE', '1')
+
 # Try to import Keras and related dependencies
 try:
     import tensorflow as tf
@@ -35,13 +45,114 @@ try:
 except ImportError:
     TF_AVAILABLE = False
 
+# Horovod is optional and only needed for 'distributed': 'horovod'
+try:
+    import horovod.tensorflow.keras as hvd
+    HVD_AVAILABLE = True
+except ImportError:
+    HVD_AVAILABLE = False
+
+# Use orjson for the model metadata sidecar when available; it is several times faster than json
+# (compact unless indent is set; values JSON can't represent are written as str())
+try:
+    import orjson
+    
+    def _dumps_metadata(obj: Any, indent: bool = False) -> bytes:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option, default=str)
+    
+    _loads_metadata = orjson.loads
+except ImportError:
+    def _dumps_metadata(obj: Any, indent: bool = False) -> bytes:
+        if indent:
+            return json.dumps(obj, indent=2, default=str).encode('utf-8')
+        return json.dumps(obj, separators=(',', ':'), default=str).encode('utf-8')
+    
+    _loads_metadata = json.loads
+
 from ..base_runtime import AIRuntime
 
+
+@tf.keras.utils.register_keras_serializable(package='ailang')
+class ConvReluPool(tf.keras.layers.Layer):
+    """Fused Conv2D + ReLU + MaxPooling2D block.
+    
+    The forward pass runs as a single XLA-compiled function, so the
+    convolution, bias add, ReLU and pooling can be fused into one kernel
+    instead of materializing each intermediate tensor.
+    """
+    
+    def __init__(self, filters: int, kernel_size: Any, pool_size: Any = (2, 2),
+                 padding: str = 'valid', **kwargs):
+        super().__init__(**kwargs)
+        self.filters = filters
+        self.kernel_size = kernel_size
+        self.pool_size = pool_size
+        self.padding = padding
+        self.conv = Conv2D(filters, kernel_size, padding=padding, activation='relu')
+        self.pool = MaxPooling2D(pool_size)
+        self._fused_forward = tf.function(self._forward, jit_compile=True)
+    
+    def build(self, input_shape):
+        # Create the weights eagerly so no variables are created inside the compiled function
+        self.conv.build(input_shape)
+        self.pool.build(self.conv.compute_output_shape(input_shape))
+        super().build(input_shape)
+    
+    def _forward(self, inputs):
+        return self.pool(self.conv(inputs))
+    
+    def call(self, inputs):
+        return self._fused_forward(inputs)
+    
+    def compute_output_shape(self, input_shape):
+        return self.pool.compute_output_shape(self.conv.compute_output_shape(input_shape))
+    
+    def get_config(self) -> Dict[str, Any]:
+        config = super().get_config()
+        config.update({
+            'filters': self.filters,
+            'kernel_size': self.kernel_size,
+            'pool_size': self.pool_size,
+            'padding': self.padding,
+        })
+        return config
+
+
+class BufferedCSVLogger(CSVLogger):
+    """CSVLogger that writes its rows in batches instead of flushing the file every epoch.
+    
+    Rows are buffered and written every ``flush_every`` epochs, and whatever is
+    left when training ends, so logging doesn't add file I/O to each epoch.
+    """
+    
+    def __init__(self, filename: str, flush_every: int = 10, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.flush_every = flush_every
+        self._pending = []
+    
+    def on_epoch_end(self, epoch, logs=None):
+        # Keras may reuse the logs dict, so keep a copy
+        self._pending.append((epoch, dict(logs or {})))
+        if len(self._pending) >= self.flush_every:
+            self._write_pending()
+    
+    def on_train_end(self, logs=None):
+        self._write_pending()
+        super().on_train_end(logs)
+    
+    def _write_pending(self):
+        for epoch, logs in self._pending:
+            super().on_epoch_end(epoch, logs)
+        self._pending = []
+
+
 # Map AILang layer types to Keras layer classes
 LAYER_MAPPING = {
     'dense': Dense,
     'conv2d': Conv2D,
     'maxpool2d': MaxPooling2D,
+    'conv_relu_pool': ConvReluPool,
     'flatten': Flatten,
     'dropout': Dropout,
     'batchnorm': BatchNormalization,
@@ -83,9 +194,83 @@ LOSS_MAPPING = {
     'mean_absolute_error': MeanAbsoluteError,
 }
 
+# Map AILang metric names to Keras metric names or classes (classes are
+# instantiated per model, since metric objects hold state)
+METRIC_MAPPING = {
+    'accuracy': 'accuracy',
+    'acc': 'accuracy',
+    'auc': AUC,
+    'precision': Precision,
+    'recall': Recall,
+}
+
+def _config_key(config: Dict[str, Any]) -> Optional[str]:
+    """Get a hashable cache key for a JSON-style sub-config, or None if it holds non-JSON values."""
+    try:
+        return json.dumps(config, sort_keys=True)
+    except TypeError:
+        return None
+
+def _resolve_optimizer(optimizer_config: Dict[str, Any]) -> Tuple[Any, Mapping[str, Any]]:
+    """Resolve an optimizer config to its Keras optimizer class and constructor arguments."""
+    optimizer_type = optimizer_config.get('type', 'adam')
+    
+    if optimizer_type not in OPTIMIZER_MAPPING:
+        raise ValueError(f"Unsupported optimizer: {optimizer_type}")
+    
+    optimizer_params = dict(optimizer_config.get('params', {}))
+    
+    # Convert learning rate to float if it's a string
+    if isinstance(optimizer_params.get('learning_rate'), str):
+        optimizer_params['learning_rate'] = float(optimizer_params['learning_rate'])
+    
+    return OPTIMIZER_MAPPING[optimizer_type], MappingProxyType(optimizer_params)
+
+def _resolve_loss(loss_config: Dict[str, Any]) -> Tuple[Any, Mapping[str, Any]]:
+    """Resolve a loss config to its Keras loss class and constructor arguments.
+    
+    Loss names Keras knows but LOSS_MAPPING doesn't resolve to the name itself,
+    with no arguments.
+    """
+    loss_type = loss_config.get('type', 'categorical_crossentropy')
+    if loss_type not in LOSS_MAPPING:
+        return loss_type, MappingProxyType({})
+    return LOSS_MAPPING[loss_type], MappingProxyType(dict(loss_config.get('params', {})))
+
+# The cached resolvers are keyed by _config_key. They cache the constructor
+# arguments rather than the objects themselves, since each model needs its own instances.
+@lru_cache(maxsize=64)
+def _resolve_optimizer_cached(optimizer_key: str) -> Tuple[Any, Mapping[str, Any]]:
+    return _resolve_optimizer(json.loads(optimizer_key))
+
+@lru_cache(maxsize=64)
+def _resolve_loss_cached(loss_key: str) -> Tuple[Any, Mapping[str, Any]]:
+    return _resolve_loss(json.loads(loss_key))
+
+# Supported values for the 'precision' config field (Keras dtype policy names)
+PRECISION_POLICIES = ('float32', 'mixed_float16', 'mixed_bfloat16')
+
+# Output activations that are computed in float32 under mixed precision for numerical stability
+FLOAT32_OUTPUT_ACTIVATIONS = ('softmax', 'sigmoid')
+
+# Supported values for the 'distributed' config field
+DISTRIBUTED_BACKENDS = ('horovod', 'mirrored')
+
+# Number of calibration examples fed to the TFLite converter for int8 quantization
+CALIBRATION_SAMPLES = 100
+
+def _weights_path(path: str) -> Optional[str]:
+    """Get the weights file used for a weights-only save to an .h5 path, or None for other formats."""
+    if not path.endswith('.h5'):
+        return None
+    return f"{path[:-len('.h5')]}.weights.h5"
+
 class KerasRuntime(AIRuntime):
     """Keras-based runtime for AILang models."""
     
+    # Callback output directories already created by any runtime in this process
+    _created_dirs: Set[str] = set()
+    
     def __init__(self, model_config: Dict[str, Any]):
         """Initialize the Keras runtime.
         
@@ -99,10 +284,85 @@ class KerasRuntime(AIRuntime):
             )
             
         super().__init__(model_config)
+        # TF32 matmuls/convolutions on Ampere+ GPUs; disable with 'enable_tf32': False
+        # for strict float32 reproducibility (the setting is process-wide)
+        tf.config.experimental.enable_tensor_float_32_execution(
+            model_config.get('enable_tf32', True)
+        )
+        
+        self._distributed = model_config.get('distributed')
+        self._strategy = None
+        self._init_distribution()
         self.history = None
         self.callbacks = []
+        self._predict_fn = None
+        self._predict_fn_model = None
+        self._predict_input_dtype = None
+        self._calibration_data = None
+        self._train_ds = None
+        self._layer_factories = self._build_layer_factories()
         self._configure_callbacks()
     
+    def _init_distribution(self) -> None:
+        """Set up multi-device training if the model config asks for it."""
+        if self._distributed is None:
+            return
+        if self._distributed not in DISTRIBUTED_BACKENDS:
+            raise ValueError(f"Unsupported distributed backend: {self._distributed}")
+        
+        if self._distributed == 'mirrored':
+            # Replicates the model on every local GPU and all-reduces gradients
+            self._strategy = tf.distribute.MirroredStrategy()
+            return
+        
+        if not HVD_AVAILABLE:
+            raise ImportError(
+                "Horovod is required for distributed training. "
+                "Install with: pip install horovod"
+            )
+        hvd.init()
+        
+        # Pin each process to a single GPU
+        gpus = tf.config.list_physical_devices('GPU')
+        if gpus:
+            gpu = gpus[hvd.local_rank()]
+            tf.config.experimental.set_memory_growth(gpu, True)
+            tf.config.set_visible_devices(gpu, 'GPU')
+    
+    def _is_chief(self) -> bool:
+        """Check if this process should write checkpoints and logs."""
+        return self._distributed != 'horovod' or hvd.rank() == 0
+    
+    def _build_layer_factories(self) -> List[Tuple[Any, Mapping[str, Any]]]:
+        """Resolve each layer config to its Keras class and normalized constructor arguments.
+        
+        This runs once per config, so re-initializing the model only has to call
+        the constructors.
+        """
+        layers_config = self.model_config.get('layers', [])
+        mixed_precision = self._precision().startswith('mixed_')
+        factories = []
+        for i, layer_config in enumerate(layers_config):
+            layer_type = layer_config.get('type')
+            if not layer_type or layer_type not in LAYER_MAPPING:
+                raise ValueError(f"Unsupported layer type: {layer_type}")
+            
+            # Copy the params so normalizing them leaves the caller's config untouched
+            layer_params = dict(layer_config.get('params', {}))
+            
+            # Convert activation function name if needed
+            activation = layer_params.get('activation')
+            if activation in ACTIVATION_MAPPING:
+                layer_params['activation'] = ACTIVATION_MAPPING[activation]
+            
+            # Keep a probability output in float32 when the rest of the model runs in reduced precision
+            if (mixed_precision and i == len(layers_config) - 1
+                    and layer_params.get('activation') in FLOAT32_OUTPUT_ACTIVATIONS):
+                layer_params['dtype'] = 'float32'
+            
+            factories.append((LAYER_MAPPING[layer_type], MappingProxyType(layer_params)))
+        return factories
+    
     def _create_model(self) -> Sequential:
         """Create a Keras Sequential model from the model config."""
         model = Sequential()
@@ -115,22 +375,7 @@ class KerasRuntime(AIRuntime):
                 model.add(InputLayer(input_shape=input_shape))
         
         # Add hidden layers
-        for layer_config in self.model_config.get('layers', []):
-            layer_type = layer_config.get('type')
-            if not layer_type or layer_type not in LAYER_MAPPING:
-                raise ValueError(f"Unsupported layer type: {layer_type}")
-            
-            # Get layer class and create layer with parameters
-            layer_class = LAYER_MAPPING[layer_type]
-            layer_params = layer_config.get('params', {})
-            
-            # Convert activation function name if needed
-            if 'activation' in layer_params:
-                activation = layer_params['activation']
-                if activation in ACTIVATION_MAPPING:
-                    layer_params['activation'] = ACTIVATION_MAPPING[activation]
-            
-            # Add layer to model
+        for layer_class, layer_params in self._layer_factories:
             model.add(layer_class(**layer_params))
         
         return model
@@ -138,34 +383,62 @@ class KerasRuntime(AIRuntime):
     def _configure_optimizer(self) -> Any:
         """Configure the optimizer from the model config."""
         optimizer_config = self.model_config.get('optimizer', {})
-        optimizer_type = optimizer_config.get('type', 'adam')
+        optimizer_key = _config_key(optimizer_config)
+        if optimizer_key is not None:
+            optimizer_class, optimizer_params = _resolve_optimizer_cached(optimizer_key)
+        else:
+            optimizer_class, optimizer_params = _resolve_optimizer(optimizer_config)
+        
+        if self._distributed == 'horovod':
+            # Each of the hvd.size() workers sees a different slice of every global batch,
+            # so scale the learning rate with the effective batch size
+            learning_rate = optimizer_params.get(
+                'learning_rate',
+                inspect.signature(optimizer_class).parameters['learning_rate'].default
+            )
+            optimizer_params = dict(optimizer_params, learning_rate=learning_rate * hvd.size())
         
-        if optimizer_type not in OPTIMIZER_MAPPING:
-            raise ValueError(f"Unsupported optimizer: {optimizer_type}")
+        optimizer = optimizer_class(**optimizer_params)
         
-        optimizer_class = OPTIMIZER_MAPPING[optimizer_type]
-        optimizer_params = optimizer_config.get('params', {})
+        # Average gradients across workers with ring-allreduce
+        if self._distributed == 'horovod':
+            optimizer = hvd.DistributedOptimizer(optimizer)
         
-        # Convert learning rate to float if it's a string
-        if 'learning_rate' in optimizer_params:
-            if isinstance(optimizer_params['learning_rate'], str):
-                optimizer_params['learning_rate'] = float(optimizer_params['learning_rate'])
+        # float16 has a narrow exponent range, so scale the loss to keep gradients from underflowing
+        # (bfloat16 keeps float32's range and needs no scaling)
+        if self._precision() == 'mixed_float16':
+            optimizer = tf.keras.mixed_precision.LossScaleOptimizer(optimizer)
         
-        return optimizer_class(**optimizer_params)
+        return optimizer
+    
+    def _jit_compile(self) -> Union[bool, str]:
+        """Get the XLA setting ('jit_compile', or its older 'xla' alias): True (default), False or Keras' 'auto'."""
+        return self.model_config.get('jit_compile', self.model_config.get('xla', True))
+    
+    def _precision(self) -> str:
+        """Get the dtype policy name from the model config."""
+        precision = self.model_config.get('precision', 'float32')
+        if precision not in PRECISION_POLICIES:
+            raise ValueError(f"Unsupported precision: {precision}")
+        return precision
     
     def _configure_loss(self) -> Any:
         """Configure the loss function from the model config."""
         loss_config = self.model_config.get('loss', {})
         loss_type = loss_config.get('type', 'categorical_crossentropy')
         
-        if isinstance(loss_type, str):
-            if loss_type not in LOSS_MAPPING:
-                # Try to use the string directly as a Keras loss
-                return loss_type
-            loss_class = LOSS_MAPPING[loss_type]
-            return loss_class(**loss_config.get('params', {}))
+        if not isinstance(loss_type, str):
+            return loss_type  # Assume it's already a callable
         
-        return loss_type  # Assume it's already a callable
+        loss_key = _config_key(loss_config)
+        if loss_key is not None:
+            loss_class, loss_params = _resolve_loss_cached(loss_key)
+        else:
+            loss_class, loss_params = _resolve_loss(loss_config)
+        if isinstance(loss_class, str):
+            # Try to use the string directly as a Keras loss
+            return loss_class
+        return loss_class(**loss_params)
     
     def _configure_metrics(self) -> List[Any]:
         """Configure metrics from the model config."""
@@ -177,17 +450,9 @@ class KerasRuntime(AIRuntime):
         metrics = []
         for metric in metrics_config:
             if isinstance(metric, str):
-                metric = metric.lower()
-                if metric in ['accuracy', 'acc']:
-                    metrics.append('accuracy')
-                elif metric in ['auc']:
-                    metrics.append(AUC())
-                elif metric in ['precision']:
-                    metrics.append(Precision())
-                elif metric in ['recall']:
-                    metrics.append(Recall())
-                else:
-                    metrics.append(metric)  # Let Keras handle other string metrics
+                # Let Keras handle other string metrics
+                metric = METRIC_MAPPING.get(metric.lower(), metric.lower())
+                metrics.append(metric() if isinstance(metric, type) else metric)
             else:
                 metrics.append(metric)  # Assume it's a Keras metric instance
         
@@ -197,14 +462,27 @@ class KerasRuntime(AIRuntime):
         """Configure callbacks from the model config."""
         callbacks_config = self.model_config.get('callbacks', [])
         
+        if self._distributed == 'horovod':
+            # Start every worker from rank 0's weights and report metrics averaged over workers
+            self.callbacks.append(hvd.callbacks.BroadcastGlobalVariablesCallback(0))
+            self.callbacks.append(hvd.callbacks.MetricAverageCallback())
+        
+        # Only one worker writes checkpoints and logs
+        is_chief = self._is_chief()
+        
+        # Output directories the callbacks write to, created together after the loop
+        output_dirs = set()
+        
         for cb_config in callbacks_config:
             cb_type = cb_config.get('type')
             cb_params = cb_config.get('params', {})
             
+            if cb_type in ('model_checkpoint', 'csv_logger', 'tensorboard') and not is_chief:
+                continue
+            
             if cb_type == 'model_checkpoint':
-                # Ensure directory exists
                 filepath = cb_params.get('filepath', 'model_checkpoint.h5')
-                os.makedirs(os.path.dirname(filepath), exist_ok=True)
+                output_dirs.add(os.path.dirname(filepath))
                 self.callbacks.append(ModelCheckpoint(**cb_params))
                 
             elif cb_type == 'early_stopping':
@@ -214,34 +492,63 @@ class KerasRuntime(AIRuntime):
                 self.callbacks.append(ReduceLROnPlateau(**cb_params))
                 
             elif cb_type == 'csv_logger':
-                # Ensure directory exists
                 filename = cb_params.get('filename', 'training.log')
-                os.makedirs(os.path.dirname(filename), exist_ok=True)
-                self.callbacks.append(CSVLogger(**cb_params))
+                output_dirs.add(os.path.dirname(filename))
+                self.callbacks.append(BufferedCSVLogger(**cb_params))
                 
             elif cb_type == 'tensorboard':
-                # Ensure log directory exists
-                log_dir = cb_params.get('log_dir', 'logs')
-                os.makedirs(log_dir, exist_ok=True)
+                output_dirs.add(cb_params.get('log_dir', 'logs'))
+                # Log once per epoch and skip profiling and the graph dump unless asked for,
+                # so the writer stays off the per-step path
+                cb_params = {'update_freq': 'epoch', 'profile_batch': 0, 'write_graph': False, **cb_params}
                 self.callbacks.append(TensorBoard(**cb_params))
+        
+        # Ensure the directories exist, skipping ones this process already created
+        # (an empty dirname means the current directory)
+        for output_dir in output_dirs - KerasRuntime._created_dirs:
+            if output_dir:
+                Path(output_dir).mkdir(parents=True, exist_ok=True)
+            KerasRuntime._created_dirs.add(output_dir)
+    
+    def _model_scope(self):
+        """Apply the dtype policy and return the scope model variables must be created under."""
+        # Set the dtype policy before any layer is created. It is process-wide in Keras,
+        # so it is set even for the float32 default, or an earlier runtime's would leak in
+        tf.keras.mixed_precision.set_global_policy(self._precision())
+        
+        # Variables must be created under the distribution strategy's scope, if there is one
+        return self._strategy.scope() if self._strategy is not None else contextlib.nullcontext()
     
     def initialize(self) -> None:
         """Initialize the Keras model."""
         if self._initialized:
             return
-            
-        # Create and compile the model
-        self.model = self._create_model()
-        
-        optimizer = self._configure_optimizer()
-        loss = self._configure_loss()
-        metrics = self._configure_metrics()
         
-        self.model.compile(
-            optimizer=optimizer,
-            loss=loss,
-            metrics=metrics
-        )
+        if self.model is not None:
+            # Re-initializing after set_config: drop the old model, its metric variables and
+            # the predict function traced against it, so repeated rebuilds don't accumulate
+            self.model = None
+            self._predict_fn = None
+            self._predict_fn_model = None
+            tf.keras.backend.clear_session()
+        
+        with self._model_scope():
+            # Create and compile the model
+            self.model = self._create_model()
+            
+            optimizer = self._configure_optimizer()
+            loss = self._configure_loss()
+            metrics = self._configure_metrics()
+            
+            # XLA-compile the train/evaluate/predict steps unless disabled in the config.
+            # compile() traces nothing, so ops XLA can't handle only fail on the first
+            # train/predict step; such models need 'jit_compile': False (or 'auto')
+            self.model.compile(
+                optimizer=optimizer,
+                loss=loss,
+                metrics=metrics,
+                jit_compile=self._jit_compile()
+            )
         
         self._initialized = True
     
@@ -256,14 +563,20 @@ class KerasRuntime(AIRuntime):
         """Train the model on the given data.
         
         Args:
-            x_train: Training input data
-            y_train: Training target data
-            x_val: Optional validation input data
+            x_train: Training input data, or a tf.data.Dataset of (input, target) batches
+            y_train: Training target data (None when x_train is a dataset)
+            x_val: Optional validation input data, or a tf.data.Dataset of validation batches
             y_val: Optional validation target data
             **kwargs: Additional training arguments
             
         Returns:
             Dictionary containing training history and metrics
+        
+        NumPy arrays are copied into a tf.data pipeline that is reused while
+        train() is called again with the same array objects and settings. The
+        reuse is keyed on the arrays' identity, not their contents: after
+        changing an array in place, pass a new array (e.g. a copy) or the
+        model trains on the data as it was when first passed.
         """
         self._ensure_initialized()
         
@@ -277,6 +590,35 @@ class KerasRuntime(AIRuntime):
         validation_data = None
         if x_val is not None and y_val is not None:
             validation_data = (x_val, y_val)
+        elif isinstance(x_val, tf.data.Dataset):
+            validation_data = x_val
+        
+        # In-memory arrays are fed through a prefetching tf.data pipeline instead,
+        # reused as long as train() is called again with the same arrays and settings
+        # (by identity; in-place changes to the arrays aren't seen, see the docstring)
+        if isinstance(x_train, np.ndarray) and isinstance(y_train, np.ndarray):
+            key = (id(x_train), id(y_train), id(x_val), id(y_val), batch_size, validation_split, shuffle)
+            if self._train_ds is None or self._train_ds[0] != key:
+                datasets = self._build_datasets(
+                    x_train, y_train, validation_data, batch_size, validation_split, shuffle
+                )
+                # Hold on to the arrays so their ids can't be reused while the key is cached
+                self._train_ds = (key, (x_train, y_train, x_val, y_val), datasets)
+            x_train, validation_data = self._train_ds[2]
+        
+        # A tf.data.Dataset already yields (x, y) batches, so batching,
+        # shuffling and validation splitting are left to the dataset
+        if isinstance(x_train, tf.data.Dataset):
+            history = self.model.fit(
+                x_train,
+                epochs=epochs,
+                validation_data=validation_data,
+                shuffle=False,
+                callbacks=self.callbacks,
+                verbose=kwargs.get('verbose', 1)
+            )
+            self.history = history.history
+            return self.history
         
         # Train the model
         history = self.model.fit(
@@ -294,6 +636,47 @@ class KerasRuntime(AIRuntime):
         self.history = history.history
         return self.history
     
+    def _build_datasets(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        validation_data: Optional[Any],
+        batch_size: int,
+        validation_split: float,
+        shuffle: bool
+    ) -> Tuple[Any, Optional[Any]]:
+        """Build the training and validation tf.data pipelines for in-memory arrays.
+        
+        Returns:
+            Tuple of the training dataset and the validation data (a dataset, or None)
+        """
+        if validation_data is None and validation_split:
+            # Hold out the last samples before shuffling, the same split model.fit makes
+            split_at = int(math.floor(len(x) * (1.0 - validation_split)))
+            if split_at == 0 or split_at == len(x):
+                raise ValueError(
+                    f"Training data contains {len(x)} samples, which is not sufficient to split it "
+                    f"into a validation and training set as specified by "
+                    f"validation_split={validation_split}. Either provide more data, or a different "
+                    f"value for validation_split."
+                )
+            validation_data = (x[split_at:], y[split_at:])
+            x, y = x[:split_at], y[:split_at]
+        
+        train_ds = tf.data.Dataset.from_tensor_slices((x, y))
+        if shuffle:
+            train_ds = train_ds.shuffle(len(x))
+        train_ds = train_ds.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+        
+        if isinstance(validation_data, tuple):
+            validation_data = (
+                tf.data.Dataset.from_tensor_slices(validation_data)
+                .batch(batch_size)
+                .prefetch(tf.data.AUTOTUNE)
+            )
+        
+        return train_ds, validation_data
+    
     def evaluate(
         self, 
         x_test: Any, 
@@ -334,7 +717,7 @@ class KerasRuntime(AIRuntime):
         
         Args:
             x: Input data for prediction
-            **kwargs: Additional prediction arguments
+            **kwargs: Additional prediction arguments ('verbose' only applies to non-array inputs)
             
         Returns:
             Model predictions
@@ -344,62 +727,167 @@ class KerasRuntime(AIRuntime):
         batch_size = kwargs.get('batch_size', 32)
         verbose = kwargs.get('verbose', 0)
         
+        # Arrays skip model.predict's per-call setup and go straight through the
+        # compiled forward pass, one batch at a time
+        if isinstance(x, np.ndarray):
+            predict_fn, input_dtype = self._get_predict_fn()
+            if input_dtype is not None:
+                x = np.asarray(x, dtype=input_dtype)
+            if len(x) <= batch_size:
+                return predict_fn(x).numpy()
+            return np.concatenate([
+                predict_fn(x[start:start + batch_size]).numpy()
+                for start in range(0, len(x), batch_size)
+            ])
+        
         return self.model.predict(
             x,
             batch_size=batch_size,
             verbose=verbose
         )
     
-    def save(self, path: str) -> None:
+    def _get_predict_fn(self) -> Tuple[Any, Optional[str]]:
+        """Get the compiled inference function for the current model, building it on first use.
+        
+        When the model's input shape is known the function gets a fixed input
+        signature with a free batch dimension, so it is traced only once.
+        
+        Returns:
+            Tuple of the function and the dtype it expects its input in (None if unconstrained)
+        """
+        if self._predict_fn_model is not self.model:
+            model = self.model
+            inputs = getattr(model, 'inputs', None)
+            if inputs and len(inputs) == 1:
+                input_spec = tf.TensorSpec([None, *inputs[0].shape[1:]], inputs[0].dtype)
+                signature = {'input_signature': [input_spec]}
+                self._predict_input_dtype = input_spec.dtype.as_numpy_dtype
+            else:
+                signature = {'reduce_retracing': True}
+                self._predict_input_dtype = None
+            self._predict_fn = tf.function(
+                lambda x: model(x, training=False),
+                # Follow the model's resolved setting, as Keras may turn XLA off (e.g. for 'auto')
+                jit_compile=bool(getattr(model, 'jit_compile', self._jit_compile())),
+                **signature
+            )
+            self._predict_fn_model = model
+        return self._predict_fn, self._predict_input_dtype
+    
+    def save(self, path: str, human_readable: bool = False) -> None:
         """Save the model to disk.
         
         Args:
             path: Path to save the model
+            human_readable: Write the metadata file indented instead of compact
         """
         self._ensure_initialized()
         
+        # Optionally export an int8-quantized TFLite model for deployment. It is
+        # converted first so that a failed conversion leaves nothing half-saved.
+        tflite_model = None
+        if self.model_config.get('quantize') == 'int8':
+            tflite_model = self._convert_to_int8_tflite()
+        
         # Ensure directory exists
         os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
         
-        # Save the model
-        self.model.save(path)
+        # For .h5 paths only the weights are written (unless 'fast_save' is False):
+        # the architecture is rebuilt from model_config on load, which skips
+        # serializing and reconstructing the layer graph
+        weights_path = _weights_path(path)
+        weights_only = weights_path is not None and self.model_config.get('fast_save', True)
+        if weights_only:
+            self.model.save_weights(weights_path)
+        else:
+            self.model.save(path)
         
         # Save additional metadata
         metadata = {
             'model_config': self.model_config,
             'class_name': self.__class__.__name__,
-            'keras_version': tf.__version__
+            'keras_version': tf.__version__,
+            'weights_only': weights_only
         }
         
         metadata_path = f"{path}.metadata.json"
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        Path(metadata_path).write_bytes(_dumps_metadata(metadata, indent=human_readable))
+        
+        if tflite_model is not None:
+            Path(f"{path}.tflite").write_bytes(tflite_model)
+    
+    def set_calibration_data(self, x: Any) -> None:
+        """Set the sample inputs used to calibrate int8 quantization on save.
+        
+        Args:
+            x: Representative input data; up to CALIBRATION_SAMPLES examples are used
+        """
+        self._calibration_data = x
+    
+    def _make_rep_ds(self) -> Any:
+        """Build the representative dataset generator for the TFLite int8 converter."""
+        if self._calibration_data is None:
+            raise ValueError(
+                "int8 quantization needs calibration data; call set_calibration_data() before save()"
+            )
+        samples = np.asarray(self._calibration_data[:CALIBRATION_SAMPLES], dtype=np.float32)
+        
+        def representative_dataset():
+            for sample in samples:
+                yield [sample[np.newaxis, ...]]
+        
+        return representative_dataset
+    
+    def _convert_to_int8_tflite(self) -> bytes:
+        """Convert the model to a TFLite flatbuffer with int8 weights and activations."""
+        converter = tf.lite.TFLiteConverter.from_keras_model(self.model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = self._make_rep_ds()
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        return converter.convert()
     
     @classmethod
-    def load(cls, path: str) -> 'KerasRuntime':
+    def load(cls, path: str, inference_only: bool = False) -> 'KerasRuntime':
         """Load a saved model from disk.
         
         Args:
             path: Path to the saved model
+            inference_only: Skip rebuilding the optimizer, loss and metrics; the
+                loaded runtime can predict but not train or evaluate
             
         Returns:
             Loaded KerasRuntime instance
         """
-        # Load the Keras model
-        model = keras_load_model(path, compile=True)
-        
         # Load metadata
         metadata_path = f"{path}.metadata.json"
         if os.path.exists(metadata_path):
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
-            model_config = metadata.get('model_config', {})
+            metadata = _loads_metadata(Path(metadata_path).read_bytes())
         else:
-            model_config = {}
+            metadata = {}
+        model_config = metadata.get('model_config', {})
         
         # Create runtime instance
         runtime = cls(model_config)
-        runtime.model = model
+        
+        # A weights-only save is restored into a model rebuilt from its config
+        weights_path = _weights_path(path)
+        if metadata.get('weights_only') and os.path.exists(weights_path):
+            if inference_only:
+                with runtime._model_scope():
+                    runtime.model = runtime._create_model()
+                runtime.model.load_weights(weights_path)
+                runtime._initialized = True
+                return runtime
+            
+            runtime.initialize()
+            # Create the optimizer's slot variables so its saved state is restored too
+            runtime.model.optimizer.build(runtime.model.trainable_variables)
+            runtime.model.load_weights(weights_path)
+            return runtime
+        
+        # Load the Keras model
+        runtime.model = keras_load_model(path, compile=not inference_only)
         runtime._initialized = True
         
         return runtime
@@ -424,4 +912,5 @@ class KerasRuntime(AIRuntime):
             config: New model configuration
         """
         self.model_config = config
+        self._layer_factories = self._build_layer_factories()
         self._initialized = False  # Need to reinitialize with new config
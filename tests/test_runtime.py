@@ -0,0 +1,96 @@
+"""
+Tests for the Keras runtime.
+"""
+
+import copy
+import unittest
+
+try:
+    import tensorflow  # noqa: F401
+    TF_AVAILABLE = True
+except ImportError:
+    TF_AVAILABLE = False
+
+
+@unittest.skipUnless(TF_AVAILABLE, "TensorFlow is not installed")
+class TestKerasRuntimeConfig(unittest.TestCase):
+    """Test cases for how KerasRuntime treats its model config."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.model_config = {
+            'input': {'shape': (4,)},
+            'layers': [
+                {'type': 'dense', 'params': {'units': 8, 'activation': 'relu'}},
+                {'type': 'dense', 'params': {'units': 2, 'activation': 'softmax'}},
+            ],
+            'precision': 'mixed_bfloat16',
+        }
+    
+    def test_layer_params_not_mutated(self):
+        """Normalizing layer params must leave the caller's config untouched."""
+        from runtime.py.runtime import KerasRuntime
+        
+        original = copy.deepcopy(self.model_config)
+        runtime = KerasRuntime(self.model_config)
+        
+        self.assertEqual(self.model_config, original)
+        
+        # The float32 output override only applies to the runtime's own copy
+        _, output_params = runtime._layer_factories[-1]
+        self.assertEqual(output_params['dtype'], 'float32')
+        self.assertNotIn('dtype', self.model_config['layers'][-1]['params'])
+    
+    def test_set_config_rebuilds_layers(self):
+        """set_config must pick up the new layer list."""
+        from runtime.py.runtime import KerasRuntime
+        
+        runtime = KerasRuntime(self.model_config)
+        runtime.set_config({'layers': [{'type': 'dense', 'params': {'units': 3}}]})
+        
+        self.assertEqual(len(runtime._layer_factories), 1)
+        self.assertEqual(runtime._layer_factories[0][1]['units'], 3)
+    
+    def test_default_precision_after_mixed(self):
+        """A runtime without a precision builds float32 layers after a mixed precision one."""
+        import tensorflow as tf
+        from runtime.py.runtime import KerasRuntime
+        
+        self.addCleanup(tf.keras.mixed_precision.set_global_policy, 'float32')
+        
+        mixed = KerasRuntime(dict(self.model_config, precision='mixed_float16'))
+        mixed.initialize()
+        self.assertEqual(mixed.model.layers[0].compute_dtype, 'float16')
+        
+        default_config = {key: value for key, value in self.model_config.items() if key != 'precision'}
+        runtime = KerasRuntime(default_config)
+        runtime.initialize()
+        self.assertEqual(runtime.model.layers[0].compute_dtype, 'float32')
+        self.assertNotIsInstance(runtime.model.optimizer, tf.keras.mixed_precision.LossScaleOptimizer)
+    
+    def test_validation_split_matches_fit(self):
+        """The held-out validation samples are the ones model.fit would hold out."""
+        import numpy as np
+        from runtime.py.runtime import KerasRuntime
+        
+        runtime = KerasRuntime(self.model_config)
+        for samples, held_out in ((95, 10), (5, 1)):
+            x = np.zeros((samples, 4), dtype='float32')
+            y = np.zeros((samples, 2), dtype='float32')
+            _, validation_data = runtime._build_datasets(x, y, None, 32, 0.1, False)
+            self.assertEqual(sum(len(batch[0]) for batch in validation_data), held_out)
+        
+        # Like fit, a split that leaves either part empty is an error
+        with self.assertRaises(ValueError):
+            runtime._build_datasets(np.zeros((1, 4)), np.zeros((1, 2)), None, 32, 0.1, False)
+    
+    def test_unsupported_layer_type(self):
+        """An unknown layer type is rejected when the runtime is created."""
+        from runtime.py.runtime import KerasRuntime
+        
+        with self.assertRaises(ValueError):
+            KerasRuntime({'layers': [{'type': 'no_such_layer'}]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Tests for the AILang transpilers.
+"""
+
+import unittest
+from types import SimpleNamespace
+
+from compiler.ir import Layer, Model, fuse_linear_layers
+from compiler.transpiler.cpp_transpiler import transpile_to_cpp
+from compiler.transpiler.js_transpiler import transpile_to_js
+from compiler.transpiler.py_transpiler import transpile_to_python
+
+
+def _program(*layers):
+    """Build IR for a single model with the given layers."""
+    return SimpleNamespace(models=[Model('Net', list(layers))])
+
+
+class TestLinearLayers(unittest.TestCase):
+    """Test cases for how the transpilers treat linear Dense layers."""
+
+    def setUp(self):
+        """Set up a model with a linear layer that an optimizing build may drop."""
+        self.layers = [
+            Layer('hidden', 256, 'relu'),
+            Layer('projection', 64, 'linear'),
+            Layer('output', 10, 'softmax'),
+        ]
+
+    def test_linear_layer_kept_by_default(self):
+        """A user-declared linear layer is emitted by every transpiler unless optimizing."""
+        ir = _program(*self.layers)
+
+        python_code = transpile_to_python(ir)
+        self.assertEqual(python_code.count('Dense('), 3)
+        self.assertIn('Dense(64, activation="linear")', python_code)
+        self.assertEqual(transpile_to_js(ir).count('tf.layers.dense('), 3)
+        cpp_code = transpile_to_cpp(ir)
+        self.assertEqual(cpp_code.count('std::make_unique<Dense>'), 3)
+        self.assertIn('/* output_size */ 64', cpp_code)
+
+        self.assertEqual(transpile_to_python(ir, optimize=True).count('Dense('), 2)
+        self.assertEqual(transpile_to_js(ir, optimize=True).count('tf.layers.dense('), 2)
+        self.assertEqual(transpile_to_cpp(ir, optimize=True).count('std::make_unique<Dense>'), 2)
+
+    def test_fuse_keeps_bottlenecks(self):
+        """A linear layer narrower than both its neighbours limits the model and is kept."""
+        fused = fuse_linear_layers(self.layers)
+        self.assertEqual([layer.name for layer in fused], ['hidden', 'output'])
+
+        bottleneck = [self.layers[0], Layer('bottleneck', 8, 'linear'), self.layers[2]]
+        self.assertEqual(fuse_linear_layers(bottleneck), bottleneck)
+
+        # The first and last layers are always kept
+        edges = [Layer('first', 4, None), self.layers[0], Layer('last', 16, None)]
+        self.assertEqual(fuse_linear_layers(edges), edges)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,9 @@
-""
+"""
 Tests for the AILang validator.
 """
 
+import os
+import shutil
 import unittest
 from pathlib import Path
 import tempfile
@@ -13,10 +15,11 @@ from validators import AILangValidator, validate_ailang
 class TestAILangValidator(unittest.TestCase):
     """Test cases for AILang validator."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.validator = AILangValidator()
-        self.valid_code = """
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures shared by every test; validate() resets the validator's state."""
+        cls.validator = AILangValidator()
+        cls.valid_code = """
         model ValidModel:
           input_shape: [28, 28, 1]
           
@@ -44,7 +47,7 @@ class TestAILangValidator(unittest.TestCase):
             batch_size: 32
         """
         
-        self.invalid_code = """
+        cls.invalid_code = """
         model invalid_model:  # Invalid: model name should be PascalCase
           layers:  # Missing required sections
             - type: simple_rnn  # Deprecated layer type
@@ -106,6 +109,20 @@ class TestAILangValidator(unittest.TestCase):
         finally:
             Path(config_path).unlink()
     
+    def test_config_changes_take_effect(self):
+        """Test that changes to a validator's config apply to later runs."""
+        validator = AILangValidator()
+        self.assertIsInstance(validator.config["required_sections"], list)
+        json.dumps(validator.config)
+        
+        validator.config["required_sections"].append("dataset")
+        _, issues = validator.validate(self.valid_code)
+        self.assertIn("Missing required section: dataset", [issue["message"] for issue in issues])
+        
+        # The defaults shared by other validators are unaffected
+        _, issues = AILangValidator().validate(self.valid_code)
+        self.assertNotIn("Missing required section: dataset", [issue["message"] for issue in issues])
+    
     def test_validate_function(self):
         """Test the validate_ailang convenience function."""
         is_valid, issues = validate_ailang(self.valid_code)
@@ -117,12 +134,81 @@ class TestAILangValidator(unittest.TestCase):
         self.assertGreater(len(issues), 0)
 
 
+class TestPerformanceAnalyzer(unittest.TestCase):
+    """Test cases for the performance analyzer."""
+    
+    def test_batch_norm_after_activation(self):
+        """Test that BatchNorm directly after an activation is reported."""
+        from validators.performance_analyzer import PerformanceAnalyzer
+        
+        def model(*layers):
+            return {'type': 'ModelDef', 'name': 'Model', 'body': list(layers)}
+        
+        dense_relu = {'type': 'LayerDef', 'layer_type': 'dense', 'params': {'units': 64, 'activation': 'relu'}}
+        dense = {'type': 'LayerDef', 'layer_type': 'dense', 'params': {'units': 64}}
+        batch_norm = {'type': 'LayerDef', 'layer_type': 'batch_norm', 'params': {'units': 64}}
+        
+        analyzer = PerformanceAnalyzer()
+        codes = [issue['code'] for issue in analyzer.analyze(model(dense_relu, batch_norm))]
+        self.assertIn('P1003', codes)
+        
+        for first_layers in ((dense,), (dense_relu, dense), ()):
+            codes = [issue['code'] for issue in analyzer.analyze(model(*first_layers, batch_norm))]
+            self.assertNotIn('P1003', codes)
+
+
+class TestSemanticAnalyzer(unittest.TestCase):
+    """Test cases for the semantic analyzer."""
+    
+    def test_deeply_nested_models(self):
+        """Test that nesting deeper than the recursion limit is analyzed, scopes restored."""
+        from validators.semantic_analyzer import SemanticAnalyzer
+        
+        ast = {'type': 'ModelDef', 'name': 'Inner', 'body': [
+            {'type': 'LayerDef', 'layer_type': 'conv2d', 'params': {}},
+        ]}
+        for _ in range(2000):
+            ast = {'type': 'ModelDef', 'name': 'Outer', 'body': [ast]}
+        
+        analyzer = SemanticAnalyzer()
+        global_table = analyzer.symbol_table
+        is_valid, issues = analyzer.analyze(ast)
+        
+        self.assertFalse(is_valid)
+        self.assertEqual([issue['code'] for issue in issues], ['E2002'])
+        self.assertIs(analyzer.symbol_table, global_table)
+    
+    def test_repeated_issue_reported_once(self):
+        """Test that an issue on a node reached twice is only reported once."""
+        from validators.semantic_analyzer import SemanticAnalyzer
+        
+        layer = {'type': 'LayerDef', 'layer_type': 'conv2d', 'params': {}, 'line': 3, 'col': 4}
+        moved_layer = dict(layer, line=5)
+        ast = {'type': 'ModelDef', 'name': 'Outer', 'body': [
+            {'type': 'ModelDef', 'name': 'First', 'body': [layer]},
+            {'type': 'ModelDef', 'name': 'Second', 'body': [layer, moved_layer]},
+        ]}
+        
+        is_valid, issues = SemanticAnalyzer().analyze(ast)
+        self.assertFalse(is_valid)
+        self.assertEqual([(issue['code'], issue['line']) for issue in issues], [('E2002', 3), ('E2002', 5)])
+        
+        # Separate layers without position info are not merged
+        ast = {'type': 'ModelDef', 'name': 'Model', 'body': [
+            {'type': 'LayerDef', 'layer_type': 'conv2d', 'params': {}},
+            {'type': 'LayerDef', 'layer_type': 'conv2d', 'params': {}},
+        ]}
+        _, issues = SemanticAnalyzer().analyze(ast)
+        self.assertEqual([issue['code'] for issue in issues], ['E2002', 'E2002'])
+
+
 class TestCLI(unittest.TestCase):
     """Test cases for the command-line interface."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.valid_code = """
+    @classmethod
+    def setUpClass(cls):
+        """Set up test fixtures; the files are only read, so all tests share them."""
+        cls.valid_code = """
         model ValidModel:
           input_shape: [28, 28, 1]
           
@@ -138,27 +224,28 @@ class TestCLI(unittest.TestCase):
             loss: categorical_crossentropy
         """
         
+        # Keep the test files in memory-backed storage when available
+        cls.tmpdir = tempfile.mkdtemp(dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+        
         # Create a temporary file with valid code
-        self.valid_file = tempfile.NamedTemporaryFile(mode='w', suffix='.ail', delete=False)
-        self.valid_file.write(self.valid_code)
-        self.valid_file.close()
+        cls.valid_file = Path(cls.tmpdir) / 'valid.ail'
+        cls.valid_file.write_text(cls.valid_code)
         
         # Create a temporary file with invalid code
-        self.invalid_file = tempfile.NamedTemporaryFile(mode='w', suffix='.ail', delete=False)
-        self.invalid_file.write("model invalid_model:\n  layers: []")
-        self.invalid_file.close()
+        cls.invalid_file = Path(cls.tmpdir) / 'invalid.ail'
+        cls.invalid_file.write_text("model invalid_model:\n  layers: []")
     
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Clean up test fixtures."""
-        Path(self.valid_file.name).unlink()
-        Path(self.invalid_file.name).unlink()
+        shutil.rmtree(cls.tmpdir)
     
     def test_validate_files_valid(self):
         """Test validation of valid files."""
         from validators.cli import validate_files
         
         exit_code = validate_files(
-            [self.valid_file.name],
+            [self.valid_file],
             output_format="text"
         )
         
@@ -169,7 +256,7 @@ class TestCLI(unittest.TestCase):
         from validators.cli import validate_files
         
         exit_code = validate_files(
-            [self.invalid_file.name],
+            [self.invalid_file],
             output_format="text"
         )
         
@@ -182,7 +269,7 @@ class TestCLI(unittest.TestCase):
         
         output = io.StringIO()
         exit_code = validate_files(
-            [self.invalid_file.name],
+            [self.invalid_file],
             output_format="json",
             output_file=output
         )
@@ -195,6 +282,41 @@ class TestCLI(unittest.TestCase):
         self.assertIn("type", issues[0])
         self.assertIn("message", issues[0])
 
+    def test_validate_files_stop_on_error(self):
+        """Test that validation stops at the first file with errors."""
+        from validators.cli import validate_files
+        import io
+
+        output = io.StringIO()
+        exit_code = validate_files(
+            [self.invalid_file, self.valid_file],
+            output_format="json",
+            output_file=output,
+            stop_on_error=True
+        )
+
+        self.assertEqual(exit_code, 1)
+
+        # Only the first file's issues are reported, as a complete JSON array
+        issues = json.loads(output.getvalue())
+        self.assertGreater(len(issues), 0)
+        self.assertEqual({issue["file"] for issue in issues}, {str(self.invalid_file)})
+
+    def test_validate_files_jobs(self):
+        """Test that concurrent validation reports the same results in file order."""
+        from validators.cli import validate_files
+        import io
+
+        files = [self.invalid_file, self.valid_file, self.invalid_file, self.valid_file]
+        outputs = []
+        for jobs in (1, 3):
+            output = io.StringIO()
+            exit_code = validate_files(files, output_format="json", output_file=output, jobs=jobs)
+            self.assertEqual(exit_code, 1)
+            outputs.append(output.getvalue())
+
+        self.assertEqual(outputs[0], outputs[1])
+
 
 if __name__ == "__main__":
     unittest.main()
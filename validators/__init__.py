@@ -10,15 +10,121 @@ This package provides validation utilities for AILang code, including:
 - Code style enforcement
 """
 
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union, Any
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple, Union, Any
+import copy
 import json
+import os
 import re
 import ast
+import bisect
+from functools import lru_cache
 
 from .semantic_analyzer import SemanticAnalyzer
 from .performance_analyzer import PerformanceAnalyzer
 
+# Patterns used on every validate() call, compiled once at import
+_MODEL_HEADER_RE = re.compile(r'^model\s+[A-Z]\w*\s*:')
+_MODEL_NAME_EXTRACT_RE = re.compile(r'^model\s+([A-Za-z0-9_]+)', re.MULTILINE)
+_LR_RE = re.compile(r'learning_rate\s*:\s*([0-9.]+)', re.IGNORECASE)
+_BRACKETS = ('{', '}', '[', ']', '(', ')')
+# Every byte except the (ASCII) brackets, for bytes.translate to delete
+_NON_BRACKET_BYTES = bytes(b for b in range(256) if chr(b) not in _BRACKETS)
+_NEWLINE_RE = re.compile(r'\n')
+
+def _line_starts(code: str) -> List[int]:
+    """Get the offset at which each line of the code starts."""
+    return [0] + [match.end() for match in _NEWLINE_RE.finditer(code)]
+
+def _line_col(line_starts: List[int], pos: int) -> Tuple[int, int]:
+    """Convert an offset into the code to a 1-based (line, col) pair."""
+    index = bisect.bisect_right(line_starts, pos) - 1
+    return index + 1, pos - line_starts[index] + 1
+
+def _section_pattern(sections: Tuple[str, ...]) -> 're.Pattern':
+    """
+    Compile a pattern finding "<section>:" headers for the given sections and "model".
+    
+    Matches anywhere on a line, case-insensitively, like a substring search of the
+    lowercased code.
+    """
+    names = sorted({section.lower() for section in sections} | {"model"})
+    alternation = '(' + '|'.join(map(re.escape, names)) + '):'
+    # A header can only overlap another if its name ends with the other's; only then is
+    # the slower zero-width lookahead needed to find both
+    if any(a != b and a.endswith(b) for a in names for b in names):
+        alternation = f'(?={alternation})'
+    return re.compile(alternation, re.IGNORECASE)
+
+# Default configuration, frozen so every validator can share it without copying
+_DEFAULT_CONFIG = MappingProxyType({
+    "max_line_length": 120,
+    "indent_size": 2,
+    "allowed_imports": ("tensorflow", "torch", "numpy"),
+    "required_sections": ("model", "train"),
+    "deprecated_constructs": MappingProxyType({
+        "layers": ("simple_rnn",),  # Example: prefer LSTM/GRU over SimpleRNN
+        "optimizers": ("sgd",),     # Example: prefer Adam/RMSprop over SGD
+    }),
+    "naming_conventions": MappingProxyType({
+        "model_name": r'^[A-Z][a-zA-Z0-9]*$',  # PascalCase
+        "variable_names": r'^[a-z][a-z0-9_]*$',  # snake_case
+    }),
+})
+
+def _thaw(value: Any) -> Any:
+    """Copy a frozen config value as the plain dicts and lists a loaded config has."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+@dataclass(frozen=True)
+class _CompiledConfig:
+    """Lookup structures derived from a validator config."""
+    required_sections: Tuple[str, ...]
+    sections_re: 're.Pattern'
+    deprecated_layers: FrozenSet[str]
+    model_name_re: 're.Pattern'
+    
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> '_CompiledConfig':
+        """
+        Compile the parts of a merged config that validate() reads.
+        
+        Configs with the same values share one compiled form, so this is cheap
+        enough to call on every run and always reflects the config's current state.
+        """
+        return _compile_config(
+            tuple(config.get("required_sections", ())),
+            tuple(config.get("deprecated_constructs", {}).get("layers", ())),
+            config["naming_conventions"]["model_name"],
+        )
+
+@lru_cache(maxsize=32)
+def _compile_config(required_sections: Tuple[str, ...], deprecated_layers: Tuple[str, ...],
+                    model_name_pattern: str) -> _CompiledConfig:
+    """Build the compiled form of a config from the values validate() reads."""
+    return _CompiledConfig(
+        required_sections=required_sections,
+        sections_re=_section_pattern(required_sections),
+        deprecated_layers=frozenset(layer.lower() for layer in deprecated_layers),
+        model_name_re=re.compile(model_name_pattern),
+    )
+
+@lru_cache(maxsize=32)
+def _load_config_cached(path: str, mtime_ns: int, size: int) -> dict:
+    """
+    Parse a config file.
+    
+    The mtime and size are part of the key so edits are picked up.
+    """
+    with open(path, 'r') as f:
+        return json.load(f)
+
 class AILangValidator:
     """Base class for AILang validators."""
     
@@ -30,31 +136,17 @@ class AILangValidator:
     
     def _load_config(self, config_path: Optional[Union[str, Path]]) -> dict:
         """Load validation configuration from a JSON file."""
-        default_config = {
-            "max_line_length": 120,
-            "indent_size": 2,
-            "allowed_imports": ["tensorflow", "torch", "numpy"],
-            "required_sections": ["model", "train"],
-            "deprecated_constructs": {
-                "layers": ["simple_rnn"],  # Example: prefer LSTM/GRU over SimpleRNN
-                "optimizers": ["sgd"],     # Example: prefer Adam/RMSprop over SGD
-            },
-            "naming_conventions": {
-                "model_name": r'^[A-Z][a-zA-Z0-9]*$',  # PascalCase
-                "variable_names": r'^[a-z][a-z0-9_]*$',  # snake_case
-            }
-        }
-        
         if not config_path:
-            return default_config
+            return _thaw(_DEFAULT_CONFIG)
             
         try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-                # Merge with defaults
-                return {**default_config, **config}
+            # Parsed configs are cached per file version; copy so callers can't alter the cached one
+            stat = os.stat(config_path)
+            config = _load_config_cached(str(config_path), stat.st_mtime_ns, stat.st_size)
+            # Merge with defaults
+            return {**_thaw(_DEFAULT_CONFIG), **copy.deepcopy(config)}
         except (FileNotFoundError, json.JSONDecodeError):
-            return default_config
+            return _thaw(_DEFAULT_CONFIG)
     
     def validate(self, code: str, file_path: Optional[Union[str, Path]] = None) -> Tuple[bool, List[Dict]]:
         """
@@ -67,14 +159,15 @@ class AILangValidator:
         Returns:
             Tuple of (is_valid, issues) where issues is a list of errors and warnings
         """
-        self.errors = []
-        self.warnings = []
+        # Reuse the issue lists across runs; the returned list is a fresh concatenation
+        self.errors.clear()
+        self.warnings.clear()
         
         # Reset state for this validation run
         self._prepare_validation()
         
-        # Run all validation methods
-        self._validate_syntax(code, file_path)
+        # One pass over the source; syntax errors are recorded right away
+        source_errors, source_warnings = self._scan_source(code, file_path)
         
         # Only proceed with deeper analysis if syntax is valid
         if not self.errors:
@@ -100,10 +193,9 @@ class AILangValidator:
                     else:
                         self.warnings.append(issue)
         
-        # Run additional validations
-        self._validate_structure(code, file_path)
-        self._validate_naming_conventions(code, file_path)
-        self._validate_best_practices(code, file_path)
+        # Report the structure, naming and best-practice issues found by the scan
+        self.errors.extend(source_errors)
+        self.warnings.extend(source_warnings)
         
         return len(self.errors) == 0, self.errors + self.warnings
     
@@ -137,134 +229,165 @@ class AILangValidator:
             })
             return None
     
-    def _validate_syntax(self, code: str, file_path: Optional[Union[str, Path]] = None):
-        """Validate basic syntax of AILang code."""
-        # Check for required sections
-        for section in self.config.get("required_sections", []):
-            if f"{section}:" not in code.lower():
-                self.errors.append({
-                    "type": "error",
-                    "code": "E1001",
-                    "message": f"Missing required section: {section}",
-                    "file": str(file_path) if file_path else "<string>",
-                    "line": 0,
-                    "col": 0
-                })
+    def _scan_source(self, code: str, file_path: Optional[Union[str, Path]] = None) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Run the source-level checks in a single walk over the lines of the code.
         
-        # Check for common syntax errors
-        if "model:" not in code.lower():
-            self.errors.append({
-                "type": "error",
-                "code": "E1002",
-                "message": "Missing 'model' section",
-                "file": str(file_path) if file_path else "<string>",
-                "line": 0,
-                "col": 0
-            })
+        Syntax errors are added to self.errors directly, since they decide whether
+        the semantic analysis runs. The structure, naming and best-practice issues
+        are returned as (errors, warnings) so they can be reported after it.
+        """
+        file = str(file_path) if file_path else "<string>"
+        errors: List[Dict] = []
+        warnings: List[Dict] = []
+        # Compiled from the config as it is now, so changes to self.config take effect
+        compiled = _CompiledConfig.from_config(self.config)
         
-        # Check for unbalanced brackets, quotes, etc.
-        for char in ['{', '}', '[', ']', '(', ')']:
-            if code.count(char) % 2 != 0:
-                self.errors.append({
-                    'type': 'error',
-                    'code': 'E1003',
-                    'message': f'Unbalanced {char} character',
-                    'file': str(file_path) if file_path else '<string>',
-                    'line': code.count('\n', 0, code.find(char)) + 1,
-                    'col': code.find(char) - code.rfind('\n', 0, code.find(char))
-                })
-    
-    def _validate_structure(self, code: str, file_path: Optional[Union[str, Path]] = None):
-        """Validate the structure of the AILang code."""
-        lines = code.split('\n')
+        # Every section header in the code, found in one scan
+        found_sections = {match.group(1).lower() for match in compiled.sections_re.finditer(code)}
         in_model_section = False
         in_layers_section = False
-        indent_stack = []
+        model_name_checked = False
+        lr_checked = False
+        has_regularization = False
+        naming_issue: Optional[Dict] = None
+        lr_issue: Optional[Dict] = None
         
-        for i, line in enumerate(lines, 1):
+        offset = 0
+        for i, line in enumerate(code.split('\n'), 1):
+            line_start = offset
+            offset += len(line) + 1
+            lowered = line.lower()
+            
+            # Best practices: regularization and the first learning rate
+            if not has_regularization and ('dropout' in lowered or 'batch_norm' in lowered):
+                has_regularization = True
+            if not lr_checked:
+                lr_match = _LR_RE.search(line)
+                if lr_match:
+                    lr_checked = True
+                    lr = float(lr_match.group(1))
+                    if lr > 0.01:
+                        lr_issue = {
+                            "type": "warning",
+                            "code": "W1003",
+                            "message": f"High learning rate detected: {lr}",
+                            "file": file,
+                            "line": i,
+                            "col": line_start + lr_match.start(),
+                            "suggestion": "Consider using a lower learning rate (e.g., 0.001) with learning rate scheduling"
+                        }
+            
+            # Naming: the first model declaration
+            if not model_name_checked:
+                model_match = _MODEL_NAME_EXTRACT_RE.match(line)
+                if model_match:
+                    model_name_checked = True
+                    model_name = model_match.group(1)
+                    if not compiled.model_name_re.match(model_name):
+                        naming_issue = {
+                            "type": "warning",
+                            "code": "W1002",
+                            "message": f"Model name '{model_name}' doesn't follow naming convention",
+                            "file": file,
+                            "line": i,
+                            "col": model_match.start(1),
+                            "suggestion": f"Rename to {model_name.title()}"
+                        }
+            
+            # Structure: skips blank and comment lines
             stripped = line.strip()
             if not stripped or stripped.startswith('#'):
                 continue
-                
-            # Track indentation
-            indent = len(line) - len(line.lstrip())
+            stripped_lower = lowered.strip()
             
             # Check for model section
-            if stripped.lower().startswith('model'):
+            if stripped_lower.startswith('model'):
                 in_model_section = True
-                if not re.match(r'^model\s+[A-Z]\w*\s*:', line.strip()):
-                    self.errors.append({
+                if not _MODEL_HEADER_RE.match(stripped):
+                    errors.append({
                         "type": "error",
                         "code": "E1003",
                         "message": "Model name must be in PascalCase",
-                        "file": str(file_path) if file_path else "<string>",
+                        "file": file,
                         "line": i,
                         "col": 0
                     })
             
             # Check layer definitions
-            if in_model_section and 'layers:' in stripped.lower():
+            if in_model_section and 'layers:' in stripped_lower:
                 in_layers_section = True
                 
             if in_layers_section and stripped.endswith(':'):
                 # This is a layer definition
                 layer_type = stripped[:-1].strip()
-                if layer_type.lower() in self.config.get("deprecated_constructs", {}).get("layers", []):
-                    self.warnings.append({
+                if layer_type.lower() in compiled.deprecated_layers:
+                    warnings.append({
                         "type": "warning",
                         "code": "W1001",
                         "message": f"Deprecated layer type: {layer_type}",
-                        "file": str(file_path) if file_path else "<string>",
+                        "file": file,
                         "line": i,
                         "col": 0,
                         "suggestion": f"Consider using a more modern alternative to {layer_type}"
                     })
-    
-    def _validate_naming_conventions(self, code: str, file_path: Optional[Union[str, Path]] = None):
-        """Validate naming conventions in the AILang code."""
-        # Extract model name
-        model_match = re.search(r'^model\s+([A-Za-z0-9_]+)', code, re.MULTILINE)
-        if model_match:
-            model_name = model_match.group(1)
-            if not re.match(self.config["naming_conventions"]["model_name"], model_name):
-                self.warnings.append({
-                    "type": "warning",
-                    "code": "W1002",
-                    "message": f"Model name '{model_name}' doesn't follow naming convention",
-                    "file": str(file_path) if file_path else "<string>",
-                    "line": code[:model_match.start()].count('\n') + 1,
-                    "col": model_match.start(1) - model_match.start(),
-                    "suggestion": f"Rename to {model_name.title()}"
+        
+        for section in compiled.required_sections:
+            if section not in found_sections:
+                self.errors.append({
+                    "type": "error",
+                    "code": "E1001",
+                    "message": f"Missing required section: {section}",
+                    "file": file,
+                    "line": 0,
+                    "col": 0
                 })
-    
-    def _validate_best_practices(self, code: str, file_path: Optional[Union[str, Path]] = None):
-        """Validate best practices in the AILang code."""
-        # Check for learning rate
-        lr_match = re.search(r'learning_rate\s*:\s*([0-9.]+)', code, re.IGNORECASE)
-        if lr_match:
-            lr = float(lr_match.group(1))
-            if lr > 0.01:
-                self.warnings.append({
-                    "type": "warning",
-                    "code": "W1003",
-                    "message": f"High learning rate detected: {lr}",
-                    "file": str(file_path) if file_path else "<string>",
-                    "line": code[:lr_match.start()].count('\n') + 1,
-                    "col": lr_match.start(),
-                    "suggestion": "Consider using a lower learning rate (e.g., 0.001) with learning rate scheduling"
+        
+        if "model" not in found_sections:
+            self.errors.append({
+                "type": "error",
+                "code": "E1002",
+                "message": "Missing 'model' section",
+                "file": file,
+                "line": 0,
+                "col": 0
+            })
+        
+        # Check for unbalanced brackets. One table-driven translate pass over the UTF-8
+        # bytes keeps only the brackets (multi-byte characters never contain ASCII bytes),
+        # and the counts run over that short remainder. The position of the first
+        # occurrence is only looked up for a character that is reported.
+        brackets = code.encode('utf-8', 'surrogatepass').translate(None, _NON_BRACKET_BYTES)
+        line_starts = None
+        for char in _BRACKETS:
+            if brackets.count(ord(char)) % 2 != 0:
+                if line_starts is None:
+                    line_starts = _line_starts(code)
+                line, col = _line_col(line_starts, code.find(char))
+                self.errors.append({
+                    'type': 'error',
+                    'code': 'E1003',
+                    'message': f'Unbalanced {char} character',
+                    'file': file,
+                    'line': line,
+                    'col': col
                 })
         
-        # Check for missing dropout/batch normalization
-        if 'dropout' not in code.lower() and 'batch_norm' not in code.lower():
-            self.warnings.append({
+        # Naming and learning-rate issues follow the per-line structure warnings
+        warnings.extend(issue for issue in (naming_issue, lr_issue) if issue is not None)
+        
+        if not has_regularization:
+            warnings.append({
                 "type": "warning",
                 "code": "W1004",
                 "message": "No regularization (dropout/batch normalization) detected",
-                "file": str(file_path) if file_path else "<string>",
+                "file": file,
                 "line": 0,
                 "col": 0,
                 "suggestion": "Consider adding dropout or batch normalization to prevent overfitting"
             })
+        
+        return errors, warnings
 
 
 class AILintError(Exception):
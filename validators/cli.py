@@ -1,42 +1,94 @@
-""
+"""
 AILang Validator Command Line Interface
 
 This module provides a command-line interface for validating AILang code.
 """
 
 import argparse
+import functools
 import json
+import os
 import sys
+import textwrap
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional, TextIO, Union
 
 from . import AILangValidator, validate_ailang
 
 
-def format_issue(issue: dict, show_suggestions: bool = True) -> str:
-    """Format an issue as a human-readable string."""
-    file_info = f"{issue.get('file', '<string>')}:{issue.get('line', 0)}:{issue.get('col', 0)}"
-    
-    # Format the message with color codes
-    if issue["type"] == "error":
-        prefix = "\033[91mERROR\033[0m"  # Red
-    else:
-        prefix = "\033[93mWARNING\033[0m"  # Yellow
-    
-    message = f"{file_info}: {prefix} [{issue['code']}] {issue['message']}"
+# Issue labels, with ANSI colors for terminals and plain for everything else
+_COLOR_LABELS = {
+    "error": "\033[91mERROR\033[0m",  # Red
+    "warning": "\033[93mWARNING\033[0m",  # Yellow
+    "suggestion": "\033[94mSuggestion:\033[0m",  # Blue
+}
+_PLAIN_LABELS = {"error": "ERROR", "warning": "WARNING", "suggestion": "Suggestion:"}
+
+
+def format_issue(issue: dict, show_suggestions: bool = True, color: bool = True) -> str:
+    """Format an issue as a human-readable string, with color codes if color is set."""
+    labels = _COLOR_LABELS if color else _PLAIN_LABELS
+    prefix = labels["error"] if issue["type"] == "error" else labels["warning"]
+    
+    message = (
+        f"{issue.get('file', '<string>')}:{issue.get('line', 0)}:{issue.get('col', 0)}: "
+        f"{prefix} [{issue['code']}] {issue['message']}"
+    )
     
     if show_suggestions and "suggestion" in issue:
-        message += f"\n    \033[94mSuggestion:\033[0m {issue['suggestion']}"
+        return f"{message}\n    {labels['suggestion']} {issue['suggestion']}"
     
     return message
 
 
+class _IssueWriter:
+    """Write issues as each file is validated, so results survive an early exit."""
+    
+    def __init__(self, output_format: str, output_file: TextIO, show_suggestions: bool):
+        self.as_json = output_format.lower() == "json"
+        self.output_file = output_file
+        self.show_suggestions = show_suggestions
+        # Color only output going to a terminal
+        isatty = getattr(output_file, "isatty", None)
+        self.color = bool(isatty and isatty())
+        self.count = 0
+    
+    def write(self, issues: List[dict]) -> None:
+        """Write one file's issues and flush them."""
+        for issue in issues:
+            if self.as_json:
+                # Matches json.dump(all_issues, indent=2), one element at a time
+                self.output_file.write(",\n" if self.count else "[\n")
+                self.output_file.write(textwrap.indent(json.dumps(issue, indent=2), "  "))
+            else:
+                print(format_issue(issue, self.show_suggestions, self.color), file=self.output_file)
+            self.count += 1
+        
+        # Hand each file's results on right away, e.g. to a tool reading a pipe
+        if issues:
+            self.output_file.flush()
+    
+    def close(self) -> None:
+        """Finish the output; for JSON this closes the array."""
+        if self.as_json:
+            self.output_file.write("\n]\n" if self.count else "[]\n")
+
+
+def _default_jobs() -> int:
+    """Get the worker count used for --jobs 0."""
+    return min(32, (os.cpu_count() or 1) * 4)
+
+
 def validate_files(
     files: List[Union[str, Path]],
     config_path: Optional[Union[str, Path]] = None,
     output_format: str = "text",
     output_file: Optional[TextIO] = None,
     show_suggestions: bool = True,
+    stop_on_error: bool = False,
+    jobs: int = 1,
 ) -> int:
     """
     Validate one or more AILang files.
@@ -47,39 +99,67 @@ def validate_files(
         output_format: Output format ('text' or 'json')
         output_file: File object to write output to (default: stdout)
         show_suggestions: Whether to include suggestions in the output
+        stop_on_error: Stop after the first file with validation errors
+        jobs: Number of files to read and validate concurrently (0 picks a
+            default from the CPU count); results are still reported in order
         
     Returns:
         Exit code (0 for success, 1 for validation errors, 2 for other errors)
     """
     if output_file is None:
         output_file = sys.stdout
+    if jobs <= 0:
+        jobs = _default_jobs()
     
+    # A validator keeps per-run state, so each worker thread gets its own
     validator = AILangValidator(config_path)
-    all_issues = []
+    local = threading.local()
+    local.validator = validator
+    
+    def read_and_validate(file_path):
+        thread_validator = getattr(local, 'validator', None)
+        if thread_validator is None:
+            thread_validator = local.validator = AILangValidator(config_path)
+        with open(file_path, 'r', encoding='utf-8') as f:
+            code = f.read()
+        return thread_validator.validate(code, file_path)
+    
+    # One callable per file that returns its result; with jobs, the files are
+    # submitted up front and each result is waited for in order
+    pool = None
+    futures = []
+    if jobs > 1 and len(files) > 1:
+        pool = ThreadPoolExecutor(max_workers=min(jobs, len(files)))
+        futures = [pool.submit(read_and_validate, file_path) for file_path in files]
+        results = [future.result for future in futures]
+    else:
+        results = [functools.partial(read_and_validate, file_path) for file_path in files]
+    
+    writer = _IssueWriter(output_format, output_file, show_suggestions)
     has_errors = False
     
-    for file_path in files:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                code = f.read()
-            
-            is_valid, issues = validator.validate(code, file_path)
-            all_issues.extend(issues)
-            
-            if not is_valid:
-                has_errors = True
+    # Issues are written per file; the output is completed even on an early return
+    try:
+        for file_path, result in zip(files, results):
+            try:
+                is_valid, issues = result()
+                writer.write(issues)
                 
-        except Exception as e:
-            print(f"Error processing {file_path}: {str(e)}", file=sys.stderr)
-            return 2
-    
-    # Output results
-    if output_format.lower() == "json":
-        json.dump(all_issues, output_file, indent=2)
-        output_file.write("\n")
-    else:
-        for issue in all_issues:
-            print(format_issue(issue, show_suggestions), file=output_file)
+                if not is_valid:
+                    has_errors = True
+                    if stop_on_error:
+                        break
+                    
+            except Exception as e:
+                print(f"Error processing {file_path}: {str(e)}", file=sys.stderr)
+                return 2
+    finally:
+        writer.close()
+        if pool is not None:
+            # Drop the files not yet started after an early exit
+            for future in futures:
+                future.cancel()
+            pool.shutdown()
     
     return 1 if has_errors else 0
 
@@ -125,6 +205,21 @@ def main():
         help="Don't show suggestions for fixing issues"
     )
     
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        dest="stop_on_error",
+        help="Stop at the first file with validation errors"
+    )
+    
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of files to validate concurrently; 0 picks one from the CPU count (default: 1)"
+    )
+    
     parser.add_argument(
         "--version",
         action="store_true",
@@ -144,7 +239,9 @@ def main():
             config_path=args.config,
             output_format=args.format,
             output_file=args.output,
-            show_suggestions=args.show_suggestions
+            show_suggestions=args.show_suggestions,
+            stop_on_error=args.stop_on_error,
+            jobs=args.jobs
         )
     except Exception as e:
         print(f"Error: {str(e)}", file=sys.stderr)
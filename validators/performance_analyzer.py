@@ -5,10 +5,14 @@ This module provides performance analysis and optimization suggestions
 for AILang model definitions.
 """
 
+from collections import Counter
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple, Any, Set
 import math
 
+# Activations prone to the dying ReLU problem
+_RELU_LIKE = frozenset({'relu', 'leaky_relu'})
+
 @dataclass
 class PerformanceIssue:
     """Represents a performance issue found in the code."""
@@ -24,8 +28,8 @@ class PerformanceAnalyzer:
     
     def __init__(self):
         self.issues: List[PerformanceIssue] = []
-        self.layer_counts: Dict[str, int] = {}
-        self.activation_counts: Dict[str, int] = {}
+        self.layer_counts: Counter = Counter()
+        self.activation_counts: Counter = Counter()
         self.param_counts: Dict[str, int] = {}
         self.total_params = 0
         self.has_batch_norm = False
@@ -33,6 +37,15 @@ class PerformanceAnalyzer:
         self.has_learning_rate_schedule = False
         self.current_layer_type = None
         self.current_layer_name = None
+        # Layers of the current model in visit order, and each one's index by id()
+        self._layer_sequence: List[dict] = []
+        self._layer_index_by_id: Dict[int, int] = {}
+        # Node type -> bound visitor, built once instead of formatting a method name per node
+        self._dispatch = {
+            name[len('_visit_'):]: getattr(self, name)
+            for name in dir(type(self))
+            if name.startswith('_visit_') and name != '_visit_node'
+        }
     
     def analyze(self, ast: dict) -> List[Dict]:
         """
@@ -62,8 +75,8 @@ class PerformanceAnalyzer:
     
     def _reset_state(self):
         """Reset the analyzer's state for a new analysis."""
-        self.layer_counts = {}
-        self.activation_counts = {}
+        self.layer_counts = Counter()
+        self.activation_counts = Counter()
         self.param_counts = {}
         self.total_params = 0
         self.has_batch_norm = False
@@ -71,150 +84,172 @@ class PerformanceAnalyzer:
         self.has_learning_rate_schedule = False
         self.current_layer_type = None
         self.current_layer_name = None
+        self._layer_sequence = []
+        self._layer_index_by_id = {}
     
     def _visit_node(self, node: dict):
-        """Dispatch to the appropriate visitor method based on node type."""
-        if not isinstance(node, dict) or 'type' not in node:
-            return
+        """
+        Visit a node and its descendants in pre-order.
+        
+        Uses an explicit stack rather than recursion, so deep ASTs don't grow the
+        Python stack. Each node is passed to the visitor for its type, if there is
+        one, and its child nodes are visited after it.
+        """
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if not isinstance(node, dict) or 'type' not in node:
+                continue
+            
+            visitor = self._dispatch.get(node['type'])
+            if visitor is not None:
+                visitor(node)
+            
+            # Push children reversed so they are popped in source order
+            stack.extend(reversed(self._child_nodes(node)))
         
-        node_type = node['type']
-        method_name = f'_visit_{node_type}'
-        visitor = getattr(self, method_name, self._generic_visit)
-        return visitor(node)
+        self.current_layer_type = None
+        self.current_layer_name = None
     
-    def _generic_visit(self, node: dict):
-        """Default visitor for node types without a specific handler."""
-        # Recursively visit child nodes
+    @staticmethod
+    def _child_nodes(node: dict) -> List[dict]:
+        """Get the dict children of a node, directly or inside list values, in order."""
+        children = []
         for value in node.values():
             if isinstance(value, dict):
-                self._visit_node(value)
+                children.append(value)
             elif isinstance(value, list):
-                for item in value:
-                    if isinstance(item, dict):
-                        self._visit_node(item)
+                children.extend(item for item in value if isinstance(item, dict))
+        return children
     
     def _visit_ModelDef(self, node: dict):
-        """Visit a model definition node."""
-        self._generic_visit(node)
+        """Visit a model definition node; its layers are visited after it."""
+        # Previous-layer lookups stay within one model
+        self._layer_sequence = []
+        self._layer_index_by_id = {}
     
     def _visit_LayerDef(self, node: dict):
         """Visit a layer definition node."""
-        self.current_layer_type = node.get('layer_type')
+        params = node.get('params') or {}
+        layer_type = self.current_layer_type = node.get('layer_type')
         self.current_layer_name = node.get('name')
         
-        # Update layer counts
-        self.layer_counts[self.current_layer_type] = self.layer_counts.get(self.current_layer_type, 0) + 1
+        # Layers are visited in order, so the ones before this one are already recorded
+        self._layer_index_by_id[id(node)] = len(self._layer_sequence)
+        self._layer_sequence.append(node)
         
-        # Check for potential issues based on layer type
-        self._analyze_layer(node)
+        # Update layer counts
+        self.layer_counts[layer_type] += 1
         
-        # Count parameters for this layer
-        self._count_layer_parameters(node)
+        # Check the layer for issues and estimate its parameters in one type-specific handler
+        handler = self._LAYER_HANDLERS.get(layer_type)
+        layer_params = handler(self, node, params, node.get('line', 0), node.get('col', 0)) if handler else 0
+        if layer_type:
+            self.param_counts[self.current_layer_name or f"{layer_type}_{len(self.param_counts)}"] = layer_params
+            self.total_params += layer_params
         
         # Check for activation functions
-        activation = node.get('params', {}).get('activation')
-        if activation:
-            self.activation_counts[activation] = self.activation_counts.get(activation, 0) + 1
-        
-        self._generic_visit(node)
+        if (activation := params.get('activation')):
+            self.activation_counts[activation] += 1
+    
+    # Layer handlers: each reports the layer's issues and returns its estimated parameter count
+    
+    def _handle_dense(self, node: dict, params: dict, line: int, col: int) -> int:
+        """Check a dense layer's width and count its weights and biases."""
+        units = params.get('units')
+        if units and units > 4096:
+            self.issues.append(PerformanceIssue(
+                f"Large dense layer with {units} units may be inefficient",
+                line,
+                col,
+                code='P1001',
+                suggestion="Consider using a smaller number of units or a different architecture"
+            ))
         
-        self.current_layer_type = None
-        self.current_layer_name = None
+        input_units = params.get('input_dim')
+        if input_units and units:
+            return input_units * units + units  # weights + biases
+        return 0
     
-    def _analyze_layer(self, node: dict):
-        """Analyze a layer for performance issues."""
-        params = node.get('params', {})
+    def _handle_conv2d(self, node: dict, params: dict, line: int, col: int) -> int:
+        """Check a conv2d layer's kernel size and count its parameters."""
+        kernel_size = params.get('kernel_size', [3, 3])
+        if isinstance(kernel_size, list) and any(k > 5 for k in kernel_size):
+            self.issues.append(PerformanceIssue(
+                f"Large kernel size {kernel_size} may be inefficient",
+                line,
+                col,
+                code='P1002',
+                suggestion="Consider using smaller kernel sizes (3x3 or 5x5) with more layers"
+            ))
         
-        if self.current_layer_type == 'dense':
-            units = params.get('units')
-            if units and units > 4096:
-                self.issues.append(PerformanceIssue(
-                    f"Large dense layer with {units} units may be inefficient",
-                    node.get('line', 0),
-                    node.get('col', 0),
-                    code='P1001',
-                    suggestion="Consider using a smaller number of units or a different architecture"
-                ))
+        filters = params.get('filters')
+        input_channels = params['input_shape'][2] if 'input_shape' in params else 3
         
-        elif self.current_layer_type == 'conv2d':
-            kernel_size = params.get('kernel_size', [3, 3])
-            if isinstance(kernel_size, list) and any(k > 5 for k in kernel_size):
-                self.issues.append(PerformanceIssue(
-                    f"Large kernel size {kernel_size} may be inefficient",
-                    node.get('line', 0),
-                    node.get('col', 0),
-                    code='P1002',
-                    suggestion="Consider using smaller kernel sizes (3x3 or 5x5) with more layers"
-                ))
-        
-        elif self.current_layer_type == 'batch_norm':
-            self.has_batch_norm = True
-            
-            # Check if batch norm is used after activation
-            prev_layer = self._find_previous_layer(node)
-            if prev_layer and prev_layer.get('params', {}).get('activation'):
-                self.issues.append(PerformanceIssue(
-                    "BatchNorm should typically come before activation functions",
-                    node.get('line', 0),
-                    node.get('col', 0),
-                    code='P1003',
-                    suggestion="Place BatchNorm layers before activation functions"
-                ))
+        if isinstance(kernel_size, int):
+            kernel_size = [kernel_size, kernel_size]
         
-        elif self.current_layer_type == 'dropout':
-            self.has_dropout = True
-            rate = params.get('rate', 0.5)
-            
-            if rate > 0.5:
-                self.issues.append(PerformanceIssue(
-                    f"High dropout rate ({rate}) may lead to underfitting",
-                    node.get('line', 0),
-                    node.get('col', 0),
-                    code='P1004',
-                    suggestion="Consider using a lower dropout rate (0.2-0.5)"
-                ))
+        if filters and kernel_size and input_channels:
+            # (kernel_h * kernel_w * input_channels + 1) * filters
+            return (kernel_size[0] * kernel_size[1] * input_channels + 1) * filters
+        return 0
     
-    def _count_layer_parameters(self, node: dict):
-        """Estimate the number of parameters in a layer."""
-        if not self.current_layer_type:
-            return
-            
-        params = node.get('params', {})
-        layer_params = 0
-        
-        if self.current_layer_type == 'dense':
-            input_units = params.get('input_dim')
-            units = params.get('units')
-            if input_units and units:
-                layer_params = input_units * units + units  # weights + biases
+    def _handle_batch_norm(self, node: dict, params: dict, line: int, col: int) -> int:
+        """Check where a batch norm layer is placed and count its parameters."""
+        self.has_batch_norm = True
         
-        elif self.current_layer_type == 'conv2d':
-            filters = params.get('filters')
-            kernel_size = params.get('kernel_size', [3, 3])
-            input_channels = params.get('input_shape', [0, 0, 0])[2] if 'input_shape' in params else 3
-            
-            if isinstance(kernel_size, int):
-                kernel_size = [kernel_size, kernel_size]
-            
-            if filters and kernel_size and input_channels:
-                # (kernel_h * kernel_w * input_channels + 1) * filters
-                layer_params = (kernel_size[0] * kernel_size[1] * input_channels + 1) * filters
+        # Check if batch norm is used after activation
+        prev_layer = self._find_previous_layer(node)
+        if prev_layer and (prev_layer.get('params') or {}).get('activation'):
+            self.issues.append(PerformanceIssue(
+                "BatchNorm should typically come before activation functions",
+                line,
+                col,
+                code='P1003',
+                suggestion="Place BatchNorm layers before activation functions"
+            ))
         
-        elif self.current_layer_type in ['batch_norm', 'layer_norm']:
-            # 4 parameters per feature: gamma, beta, moving_mean, moving_variance
-            layer_params = 4 * params.get('units', 0)
+        return self._handle_layer_norm(node, params, line, col)
+    
+    def _handle_layer_norm(self, node: dict, params: dict, line: int, col: int) -> int:
+        """Count the parameters of a normalization layer."""
+        # 4 parameters per feature: gamma, beta, moving_mean, moving_variance
+        return 4 * params.get('units', 0)
+    
+    def _handle_dropout(self, node: dict, params: dict, line: int, col: int) -> int:
+        """Check a dropout layer's rate; dropout has no parameters."""
+        self.has_dropout = True
+        rate = params.get('rate', 0.5)
         
-        self.param_counts[self.current_layer_name or f"{self.current_layer_type}_{len(self.param_counts)}"] = layer_params
-        self.total_params += layer_params
+        if rate > 0.5:
+            self.issues.append(PerformanceIssue(
+                f"High dropout rate ({rate}) may lead to underfitting",
+                line,
+                col,
+                code='P1004',
+                suggestion="Consider using a lower dropout rate (0.2-0.5)"
+            ))
+        return 0
+    
+    _LAYER_HANDLERS = {
+        'dense': _handle_dense,
+        'conv2d': _handle_conv2d,
+        'batch_norm': _handle_batch_norm,
+        'layer_norm': _handle_layer_norm,
+        'dropout': _handle_dropout,
+    }
     
     def _find_previous_layer(self, node: dict) -> Optional[dict]:
-        """Find the previous layer in the model."""
-        # This is a simplified implementation - in a real implementation,
-        # you'd need to traverse the AST to find the previous layer
-        return None
+        """Find the previous layer in the model, or None for its first layer."""
+        index = self._layer_index_by_id.get(id(node), 0)
+        return self._layer_sequence[index - 1] if index > 0 else None
     
     def _post_process_analysis(self):
         """Perform any post-processing after the full AST has been visited."""
+        # Every check below needs at least one layer
+        if not self.layer_counts:
+            return
+        
         # Check for lack of batch normalization
         if not self.has_batch_norm and self.layer_counts.get('dense', 0) > 1:
             self.issues.append(PerformanceIssue(
@@ -233,7 +268,7 @@ class PerformanceAnalyzer:
         
         # Check for overuse of activation functions
         for act, count in self.activation_counts.items():
-            if count > 5 and act in ['relu', 'leaky_relu']:
+            if count > 5 and act in _RELU_LIKE:
                 self.issues.append(PerformanceIssue(
                     f"Multiple ({count}) {act} activations may lead to dying ReLU problem",
                     code='P1102',
@@ -253,9 +288,10 @@ class PerformanceAnalyzer:
         
         # Check for imbalanced layer distribution
         if len(self.layer_counts) > 3:
-            max_layers = max(self.layer_counts.values())
+            # A layer type is over-represented at more than twice the mean count per type
+            threshold = 2 * (sum(self.layer_counts.values()) / len(self.layer_counts))
             for layer_type, count in self.layer_counts.items():
-                if count > 5 and count > 2 * (sum(self.layer_counts.values()) / len(self.layer_counts)):
+                if count > 5 and count > threshold:
                     self.issues.append(PerformanceIssue(
                         f"Potential imbalance: {count} {layer_type} layers detected",
                         code='P1104',
@@ -10,8 +10,31 @@ from dataclasses import dataclass, field
 from enum import Enum, auto
 import re
 
+# Naming-convention patterns checked on every model and layer node
+_PASCAL_RE = re.compile(r'^[A-Z][a-zA-Z0-9]*$')
+_SNAKE_RE = re.compile(r'^[a-z][a-z0-9_]*$')
+
+_DEPRECATED_LAYERS = frozenset({'simple_rnn'})
+_DEPRECATED_OPTIMIZERS = frozenset({'sgd'})  # Add other deprecated optimizers as needed
+
+# Parameters each layer type must be given
+_REQUIRED_LAYER_PARAMS = {
+    'conv2d': ('filters',),
+}
+
+# Built-in activation functions, each typed tensor -> tensor
+_ACTIVATIONS = (
+    'relu', 'sigmoid', 'tanh', 'softmax', 'softplus', 'softsign',
+    'selu', 'elu', 'exponential', 'leaky_relu', 'prelu', 'swish',
+)
+
+# Walk stack marker: (_EXIT_SCOPE, table) restores table once a node's children are done
+_EXIT_SCOPE = object()
+
 class AIType:
     """Base class for AILang types."""
+    __slots__ = ()
+    
     def __eq__(self, other):
         return isinstance(other, type(self))
     
@@ -20,21 +43,64 @@ class AIType:
 
 class TensorType(AIType):
     """Type for tensors with shape information."""
+    __slots__ = ('shape', 'dtype', '_has_wild')
+    
+    # (shape, dtype) -> shared instance, for get()
+    _intern: Dict[Tuple[Any, str], 'TensorType'] = {}
+    
     def __init__(self, shape: Optional[List[Union[int, str]]] = None, dtype: str = 'float32'):
-        self.shape = shape or []
+        self.shape = tuple(shape or ())
         self.dtype = dtype
+        # Unknown (None) dimensions match anything, so they need the per-dimension comparison
+        self._has_wild = None in self.shape
+    
+    @classmethod
+    def get(cls, shape: Tuple[Union[int, str, None], ...] = (), dtype: str = 'float32') -> 'TensorType':
+        """Get the shared tensor type for a shape and dtype, so equal types can be compared by identity."""
+        key = (tuple(shape), dtype)
+        tensor_type = cls._intern.get(key)
+        if tensor_type is None:
+            tensor_type = cls._intern[key] = cls(shape, dtype)
+        return tensor_type
     
     def __eq__(self, other):
         if not isinstance(other, TensorType):
             return False
-        # For shapes, we consider them equal if they have the same length
-        # and all non-None dimensions match
-        if len(self.shape) != len(other.shape):
+        if self.dtype != other.dtype:
+            return False
+        # Fully known shapes compare as tuples
+        if not (self._has_wild or other._has_wild):
+            return self.shape == other.shape
+        # Otherwise they are equal if they have the same length and all non-None dimensions match
+        shape, other_shape = self.shape, other.shape
+        rank = len(shape)
+        if rank != len(other_shape):
             return False
-        for s1, s2 in zip(self.shape, other.shape):
-            if s1 is not None and s2 is not None and s1 != s2:
-                return False
-        return self.dtype == other.dtype
+        # Ranks up to 4, nearly every tensor (e.g. an unknown batch size), are compared
+        # unrolled; higher ranks fall back to the general loop
+        if rank == 4:
+            a, b, c, d = shape
+            e, f, g, h = other_shape
+            return ((a is None or e is None or a == e) and (b is None or f is None or b == f)
+                    and (c is None or g is None or c == g) and (d is None or h is None or d == h))
+        if rank == 3:
+            a, b, c = shape
+            e, f, g = other_shape
+            return ((a is None or e is None or a == e) and (b is None or f is None or b == f)
+                    and (c is None or g is None or c == g))
+        if rank == 2:
+            a, b = shape
+            e, f = other_shape
+            return (a is None or e is None or a == e) and (b is None or f is None or b == f)
+        if rank == 1:
+            a, = shape
+            e, = other_shape
+            return a is None or e is None or a == e
+        return all(s1 is None or s2 is None or s1 == s2 for s1, s2 in zip(shape, other_shape))
+    
+    def __hash__(self):
+        # Consistent with __eq__: equal tensors always share a rank and dtype
+        return hash((len(self.shape), self.dtype))
     
     def __str__(self):
         shape_str = '[' + ', '.join(str(d) for d in self.shape) + ']' if self.shape else '[]'
@@ -42,6 +108,8 @@ class TensorType(AIType):
 
 class FunctionType(AIType):
     """Type for functions with parameter and return types."""
+    __slots__ = ('params', 'returns')
+    
     def __init__(self, params: List[AIType], returns: AIType):
         self.params = params
         self.returns = returns
@@ -58,9 +126,33 @@ class FunctionType(AIType):
 
 class SymbolTable:
     """Symbol table for tracking variables and their types."""
+    __slots__ = ('parent', '_symbols', '_chain')
+    
     def __init__(self, parent: Optional['SymbolTable'] = None):
         self.parent = parent
-        self.symbols: Dict[str, AIType] = {}
+        # A scope's dict is only created once it's used or gets a child scope
+        # (which must see later definitions); until then it resolves through
+        # its parent's chain unchanged
+        self._symbols: Optional[Dict[str, AIType]] = None
+        self._chain: List[Dict[str, AIType]] = []
+        if parent is not None:
+            parent._materialize()
+            self._chain = parent._chain
+        else:
+            self._materialize()
+    
+    def _materialize(self) -> Dict[str, AIType]:
+        """Create this scope's symbol dict (and its resolve chain) if it doesn't exist yet, and return it."""
+        if self._symbols is None:
+            self._symbols = {}
+            # This scope's symbols followed by each enclosing scope's, innermost first
+            self._chain = [self._symbols] + self._chain
+        return self._symbols
+    
+    @property
+    def symbols(self) -> Dict[str, AIType]:
+        """The symbols defined in this scope."""
+        return self._materialize()
     
     def define(self, name: str, type_: AIType) -> None:
         """Define a new symbol in the current scope."""
@@ -68,10 +160,9 @@ class SymbolTable:
     
     def resolve(self, name: str) -> Optional[AIType]:
         """Resolve a symbol, checking parent scopes if not found."""
-        if name in self.symbols:
-            return self.symbols[name]
-        if self.parent is not None:
-            return self.parent.resolve(name)
+        for symbols in self._chain:
+            if name in symbols:
+                return symbols[name]
         return None
 
 @dataclass
@@ -87,26 +178,40 @@ class SemanticAnalyzer:
     """Performs semantic analysis on AILang code."""
     
     def __init__(self):
-        self.errors: List[SemanticError] = []
-        self.warnings: List[SemanticError] = []
+        # Issues are kept as the dicts analyze() returns, errors and warnings apart
+        self.errors: List[Dict] = []
+        self.warnings: List[Dict] = []
+        # (id(node), code, message) of each issue recorded -> its node, so a node reached
+        # twice is reported once; holding the node keeps its id from being reused
+        self._seen_issues: Dict[Tuple[int, str, str], dict] = {}
         self.symbol_table = SymbolTable()
+        # (id(expected), id(actual)) -> the pair, for type pairs found compatible; holding
+        # the pair keeps both objects alive, so their ids can't be reused for other types
+        self._compat_cache: Dict[Tuple[int, int], Tuple[AIType, AIType]] = {}
         self._initialize_builtins()
+        # Node type -> bound visitor, built once instead of formatting a method name per node
+        self._dispatch = {
+            name[len('_visit_'):]: getattr(self, name)
+            for name in dir(type(self))
+            if name.startswith('_visit_') and name != '_visit_node'
+        }
+        # The base _generic_visit is a no-op, so unhandled nodes skip the call entirely
+        # unless a subclass overrides it
+        self._unhandled_visitor = (
+            None if type(self)._generic_visit is SemanticAnalyzer._generic_visit else self._generic_visit
+        )
     
     def _initialize_builtins(self):
         """Initialize built-in types and functions."""
         # Tensor types
-        self.symbol_table.define("Tensor", TensorType())
-        self.symbol_table.define("float32", TensorType(dtype='float32'))
-        self.symbol_table.define("float64", TensorType(dtype='float64'))
-        self.symbol_table.define("int32", TensorType(dtype='int32'))
+        self.symbol_table.define("Tensor", TensorType.get())
+        self.symbol_table.define("float32", TensorType.get(dtype='float32'))
+        self.symbol_table.define("float64", TensorType.get(dtype='float64'))
+        self.symbol_table.define("int32", TensorType.get(dtype='int32'))
         
-        # Common activation functions
-        for func in ['relu', 'sigmoid', 'tanh', 'softmax', 'softplus', 'softsign',
-                    'selu', 'elu', 'exponential', 'leaky_relu', 'prelu', 'swish']:
-            self.symbol_table.define(
-                func,
-                FunctionType([TensorType()], TensorType())
-            )
+        # Common activation functions, all sharing one tensor -> tensor type
+        activation_type = FunctionType([TensorType.get()], TensorType.get())
+        self.symbol_table.symbols.update(dict.fromkeys(_ACTIVATIONS, activation_type))
     
     def analyze(self, ast: dict) -> Tuple[bool, List[Dict]]:
         """
@@ -120,40 +225,94 @@ class SemanticAnalyzer:
         """
         self.errors = []
         self.warnings = []
+        self._seen_issues.clear()
+        self._compat_cache.clear()
         
         # Start analysis from the root of the AST
         self._visit_node(ast)
         
-        # Convert errors and warnings to dictionaries
-        issues = []
-        for error in self.errors:
-            issues.append({
-                'type': 'error',
-                'code': error.code or 'E2000',
-                'message': error.message,
-                'line': error.line,
-                'col': error.col,
-                'suggestion': error.suggestion
-            })
+        # Errors come first in the issues, then warnings, each in the order found
+        return not self.errors, self.errors + self.warnings
+    
+    def _visit_node(self, node: dict):
+        """
+        Visit a node and the children its visitor returns, in pre-order.
         
-        for warning in self.warnings:
-            issues.append({
-                'type': 'warning',
-                'code': warning.code or 'W2000',
-                'message': warning.message,
-                'line': warning.line,
-                'col': warning.col,
-                'suggestion': warning.suggestion
-            })
+        Uses an explicit stack rather than recursion, so deeply nested models
+        don't grow the Python stack. A visitor that opens a new scope leaves it
+        in self.symbol_table; the previous table is restored after its children.
+        """
+        stack = [node]
+        # Bound once, as this loop runs per node
+        pop = stack.pop
+        push = stack.append
+        push_all = stack.extend
+        get_visitor = self._dispatch.get
+        unhandled = self._unhandled_visitor
         
-        return len(self.errors) == 0, issues
+        while stack:
+            node = pop()
+            if type(node) is tuple:
+                # (_EXIT_SCOPE, table): the scope's children have all been visited
+                self.symbol_table = node[1]
+                continue
+            
+            visitor = get_visitor(node.get('type'), unhandled)
+            if visitor is None:
+                continue
+            
+            table = self.symbol_table
+            children = visitor(node)
+            if self.symbol_table is not table:
+                push((_EXIT_SCOPE, table))
+            if children:
+                # Push children reversed so they are popped in source order
+                push_all(reversed(children))
     
-    def _visit_node(self, node: dict):
-        """Dispatch to the appropriate visitor method based on node type."""
-        node_type = node.get('type')
-        method_name = f'_visit_{node_type}'
-        visitor = getattr(self, method_name, self._generic_visit)
-        return visitor(node)
+    def _is_repeat(self, node: Optional[dict], code: str, message: str) -> bool:
+        """Check if this issue was already recorded for this node, marking it recorded if not."""
+        if node is None:
+            return False
+        key = (id(node), code, message)
+        if key in self._seen_issues:
+            return True
+        self._seen_issues[key] = node
+        return False
+    
+    def _error(self, message: str, line: int, col: int, code: str = '', suggestion: Optional[str] = None,
+               node: Optional[dict] = None) -> None:
+        """Record an error, unless it was already recorded for the same node."""
+        code = code or 'E2000'
+        if self._is_repeat(node, code, message):
+            return
+        self.errors.append({
+            'type': 'error',
+            'code': code,
+            'message': message,
+            'line': line,
+            'col': col,
+            'suggestion': suggestion
+        })
+    
+    def _warning(self, message: str, line: int, col: int, code: str = '', suggestion: Optional[str] = None,
+                 node: Optional[dict] = None) -> None:
+        """Record a warning, unless it was already recorded for the same node."""
+        code = code or 'W2000'
+        if self._is_repeat(node, code, message):
+            return
+        self.warnings.append({
+            'type': 'warning',
+            'code': code,
+            'message': message,
+            'line': line,
+            'col': col,
+            'suggestion': suggestion
+        })
+    
+    @staticmethod
+    def _loc(node: dict) -> Tuple[int, int]:
+        """Get a node's (line, col) for error reporting."""
+        return node.get('line', 0), node.get('col', 0)
     
     def _generic_visit(self, node: dict):
         """Default visitor for node types without a specific handler."""
@@ -161,114 +320,144 @@ class SemanticAnalyzer:
         pass
     
     def _visit_ModelDef(self, node: dict):
-        """Visit a model definition node."""
+        """Visit a model definition node; returns its body, visited in the model's scope."""
         model_name = node.get('name')
+        line, col = self._loc(node)
         
         # Check model name follows conventions
-        if not re.match(r'^[A-Z][a-zA-Z0-9]*$', model_name):
-            self.errors.append(SemanticError(
+        if not _PASCAL_RE.match(model_name):
+            self._error(
                 f"Model name '{model_name}' should be in PascalCase",
-                node.get('line', 0),
-                node.get('col', 0),
+                line,
+                col,
                 code='E2001',
-                suggestion=f"Rename model to {model_name[0].upper() + model_name[1:]}"
-            ))
-        
-        # Create a new scope for the model
-        old_table = self.symbol_table
-        self.symbol_table = SymbolTable(old_table)
-        
-        # Process the model body
-        for item in node.get('body', []):
-            self._visit_node(item)
+                suggestion=f"Rename model to {model_name[0].upper() + model_name[1:]}",
+                node=node
+            )
         
-        # Restore the previous symbol table
-        self.symbol_table = old_table
+        # Create a new scope for the model; _visit_node restores the previous
+        # symbol table once the body has been processed
+        self.symbol_table = SymbolTable(self.symbol_table)
+        return node.get('body', [])
     
     def _visit_LayerDef(self, node: dict):
         """Visit a layer definition node."""
         layer_type = node.get('layer_type')
         layer_name = node.get('name')
+        line, col = self._loc(node)
         
         # Check layer name follows conventions
-        if layer_name and not re.match(r'^[a-z][a-z0-9_]*$', layer_name):
-            self.warnings.append(SemanticError(
+        if layer_name and not _SNAKE_RE.match(layer_name):
+            self._warning(
                 f"Layer name '{layer_name}' should be in snake_case",
-                node.get('line', 0),
-                node.get('col', 0),
+                line,
+                col,
                 code='W2001',
-                suggestion='Use snake_case for layer names'
-            ))
+                suggestion='Use snake_case for layer names',
+                node=node
+            )
         
         # Check for deprecated layer types
-        if layer_type in ['simple_rnn']:
-            self.warnings.append(SemanticError(
+        if layer_type in _DEPRECATED_LAYERS:
+            self._warning(
                 f"Deprecated layer type: {layer_type}",
-                node.get('line', 0),
-                node.get('col', 0),
+                line,
+                col,
                 code='W2002',
-                suggestion=f"Consider using a more modern alternative to {layer_type}"
-            ))
+                suggestion=f"Consider using a more modern alternative to {layer_type}",
+                node=node
+            )
         
         # Check required parameters
-        if layer_type == 'conv2d':
-            if 'filters' not in node.get('params', {}):
-                self.errors.append(SemanticError(
-                    "Missing required parameter 'filters' for conv2d layer",
-                    node.get('line', 0),
-                    node.get('col', 0),
-                    code='E2002'
-                ))
+        required_params = _REQUIRED_LAYER_PARAMS.get(layer_type)
+        if required_params:
+            params = node.get('params', {})
+            for param in required_params:
+                if param not in params:
+                    self._error(
+                        f"Missing required parameter '{param}' for {layer_type} layer",
+                        line,
+                        col,
+                        code='E2002',
+                        node=node
+                    )
     
     def _visit_TrainingConfig(self, node: dict):
         """Visit a training configuration node."""
+        line, col = self._loc(node)
+        
         # Check learning rate
         lr = node.get('learning_rate')
         if lr is not None:
-            try:
+            # Numbers, the usual case, convert without the try; anything else
+            # (strings, numpy scalars, ...) goes through float() as before
+            if isinstance(lr, (int, float)):
                 lr_val = float(lr)
-                if lr_val > 0.01:
-                    self.warnings.append(SemanticError(
-                        f"High learning rate: {lr_val}",
-                        node.get('line', 0),
-                        node.get('col', 0),
-                        code='W2003',
-                        suggestion="Consider using a lower learning rate with scheduling"
-                    ))
-            except (ValueError, TypeError):
-                self.errors.append(SemanticError(
-                    f"Invalid learning rate: {lr}",
-                    node.get('line', 0),
-                    node.get('col', 0),
-                    code='E2003'
-                ))
+            else:
+                try:
+                    lr_val = float(lr)
+                except (ValueError, TypeError):
+                    lr_val = None
+                    self._error(
+                        f"Invalid learning rate: {lr}",
+                        line,
+                        col,
+                        code='E2003',
+                        node=node
+                    )
+            
+            if lr_val is not None and lr_val > 0.01:
+                self._warning(
+                    f"High learning rate: {lr_val}",
+                    line,
+                    col,
+                    code='W2003',
+                    suggestion="Consider using a lower learning rate with scheduling",
+                    node=node
+                )
         
-        # Check optimizer
-        optimizer = node.get('optimizer', '').lower()
-        if optimizer in ['sgd']:  # Add other deprecated optimizers as needed
-            self.warnings.append(SemanticError(
+        # Check optimizer; an exact lowercase name skips the lower() copy, and a
+        # missing or empty optimizer skips the check altogether
+        optimizer = node.get('optimizer')
+        if optimizer and (
+            optimizer in _DEPRECATED_OPTIMIZERS
+            or (optimizer := optimizer.lower()) in _DEPRECATED_OPTIMIZERS
+        ):
+            self._warning(
                 f"Suboptimal optimizer: {optimizer}",
-                node.get('line', 0),
-                node.get('col', 0),
+                line,
+                col,
                 code='W2004',
-                suggestion=f"Consider using 'adam' or another modern optimizer instead of {optimizer}"
-            ))
+                suggestion=f"Consider using 'adam' or another modern optimizer instead of {optimizer}",
+                node=node
+            )
     
     def _check_type_compatibility(self, expected: AIType, actual: AIType, node: dict) -> bool:
         """Check if actual type is compatible with expected type."""
-        if expected == actual:
+        if expected is actual:
+            return True
+        
+        # The same builtin type objects are compared over and over; only successes are
+        # cached, so a mismatch is reported every time it occurs
+        key = (id(expected), id(actual))
+        if key in self._compat_cache:
             return True
         
-        # Handle tensor compatibility (allow different shapes but same dtype)
-        if (isinstance(expected, TensorType) and 
-            isinstance(actual, TensorType) and 
-            expected.dtype == actual.dtype):
+        # Equal types, or tensors with the same dtype (shapes may differ)
+        if expected == actual or (
+            isinstance(expected, TensorType) and
+            isinstance(actual, TensorType) and
+            expected.dtype == actual.dtype
+        ):
+            self._compat_cache[key] = (expected, actual)
             return True
         
-        self.errors.append(SemanticError(
+        line, col = self._loc(node)
+        self._error(
             f"Type mismatch: expected {expected}, got {actual}",
-            node.get('line', 0),
-            node.get('col', 0),
-            code='E2100'
-        ))
+            line,
+            col,
+            code='E2100',
+            node=node
+        )
         return False